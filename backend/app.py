@@ -1,137 +1,247 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, current_app, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 import os
+import io
+import csv
+import json
+import zlib
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import date, datetime, timezone
+from models import Base, Job, JOB_FIELDS, JOB_COLUMNS
+from cache import create_cache
+from database import DATABASE_URL, engine_options, pool_stats
+from metrics import instrument_app, metrics_response
+from ingest import insert_job_rows, iter_json_rows, validate_job_row
+from changes import CHANGE_LOG_STATE_QUERY, ChangesPruned, changes_params, check_since, changes_after, changes_response
+from listing import (
+    DATASET_VERSION_QUERY, apply_filters, count_statement, page_params, page_listing, clamp_page, page_slice,
+    page_response, is_cursor_request, cursor_params, cursor_listing, after_cursor, cursor_response,
+    listing_etag, is_not_modified, top_facets, facets_response, use_fast_json
+)
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)
-
-# Database configuration
-POSTGRES_USER = os.getenv("POSTGRES_USER")
-POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-DB_NAME = os.getenv("POSTGRES_DB")
-POSTGRES_HOST = os.getenv("POSTGRES_HOST")
-PORT = os.getenv("POSTGRES_PORT")
-
-DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{PORT}/{DB_NAME}"
-
-# Configure SQLAlchemy
-app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-# Initialize Flask-SQLAlchemy and Flask-Migrate
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
-
-# Models
-class Job(db.Model):
-    __tablename__ = 'jobs'
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String)
-    company = db.Column(db.String)
-    location = db.Column(db.String)
-    job_type = db.Column(db.String)
-    tags = db.Column(db.Text)
-    date_posted = db.Column(db.String)
-    link = db.Column(db.String)
-    logo = db.Column(db.String)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'company': self.company,
-            'location': self.location,
-            'job_type': self.job_type,
-            'tags': self.tags,
-            'date_posted': self.date_posted or datetime.utcnow().strftime('%Y-%m-%d'),
-            'link': self.link,
-            'logo': self.logo,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+# Flask-SQLAlchemy on the shared models' metadata, bound to an app by create_app
+db = SQLAlchemy(metadata=Base.metadata)
+api = Blueprint('api', __name__)
+
+def create_app(migrations=True):
+    """Build the API app and its database engine.
+
+    Flask-Migrate (and with it alembic) is only needed by the `flask db`
+    commands, so serving processes pass migrations=False and skip
+    importing it.
+    """
+    app = Flask(__name__)
+    use_fast_json(app)
+    CORS(app)
+
+    # Configure SQLAlchemy, with the pool and statement timeout from database.py
+    app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options()
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    if migrations:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
+    app.register_blueprint(api)
+    with app.app_context():
+        instrument_app(app, db.engine)
+    return app
+
+# Cache for GET /api/jobs responses, invalidated on every write
+job_cache = create_cache()
+
+# Query helpers
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 500))
+
+def ndjson_line(data):
+    return current_app.json.dumps(data) + '\n'
+
+# Export encoders: turn column tuples into text chunks without building dicts
+EXPORT_BATCH_SIZE = 1000
+
+def export_value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+def encode_ndjson(rows):
+    template = '{' + ','.join(f'{json.dumps(name)}:%s' for name in JOB_FIELDS) + '}\n'
+    lines = []
+    for row in rows:
+        lines.append(template % tuple(json.dumps(export_value(value)) for value in row))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield ''.join(lines)
+            lines = []
+    yield ''.join(lines)
+
+def encode_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(JOB_FIELDS)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow([export_value(value) for value in row])
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', encode_ndjson),
+    'csv': ('text/csv', encode_csv),
+}
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+def list_jobs(args):
+    if is_cursor_request(args):
+        return list_jobs_by_cursor(args)
+
+    page, per_page = page_params(args)
+    query = page_listing(args)
+
+    # Count first so an out-of-range page can be clamped before fetching it
+    total_jobs = db.session.execute(count_statement(query)).scalar()
+    page, total_pages = clamp_page(page, per_page, total_jobs)
+    jobs = db.session.execute(page_slice(query, page, per_page)).all()
+
+    return page_response(jobs, total_jobs, page, per_page, total_pages)
+
+def list_jobs_by_cursor(args):
+    limit, cursor, include_total, key = cursor_params(args)
+    query = cursor_listing(args)
+
+    total = db.session.execute(count_statement(query)).scalar() if include_total else None
+    jobs = db.session.execute(after_cursor(query, cursor, limit, key)).all()
+    return cursor_response(jobs, limit, key, total)
+
+def get_dataset_version():
+    return db.session.execute(DATASET_VERSION_QUERY).one()
 
 # Routes
-@app.route('/api/jobs', methods=['GET'])
+@api.route('/api/jobs', methods=['GET'])
 def get_jobs():
     try:
-        # Get filter parameters
-        location = request.args.get('location')
-        company = request.args.get('company')
-        job_type = request.args.get('job_type')
-
-        # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-
-        # Build query
-        query = Job.query
-        if location:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
-        if company:
-            query = query.filter(Job.company.ilike(f'%{company}%'))
-        if job_type:
-            query = query.filter(Job.job_type.ilike(f'%{job_type}%'))
-
-        # Get total count for pagination
-        total_jobs = query.count()
-
-        # Calculate total pages
-        total_pages = (total_jobs + per_page - 1) // per_page if total_jobs > 0 else 1
+        version, _, updated_at = get_dataset_version()
+        etag = listing_etag(version, request.args)
+        last_modified = updated_at.replace(microsecond=0, tzinfo=timezone.utc)
+
+        if is_not_modified(request, etag, last_modified):
+            response = current_app.response_class(status=304)
+        else:
+            cache_key = job_cache.key(request.args, version)
+            body = job_cache.get(cache_key)
+            if body is None:
+                body = current_app.json.dumps(list_jobs(request.args))
+                job_cache.set(cache_key, body)
+            response = current_app.response_class(body, mimetype='application/json')
 
-        # Ensure page is within valid range
-        if page < 1:
-            page = 1
-        elif page > total_pages:
-            page = total_pages
+        # Clients may keep the body but must revalidate it on every poll
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        # Apply pagination
-        jobs = query.paginate(page=page, per_page=per_page)
+@api.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify(job_cache.stats())
 
-        return jsonify({
-            'jobs': [job.to_dict() for job in jobs.items],
-            'pagination': {
-                'total': total_jobs,
-                'page': page,
-                'per_page': per_page,
-                'total_pages': total_pages
-            }
-        })
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics: request latency per route and DB queries per request."""
+    return metrics_response(current_app, db.engine)
+
+@api.route('/api/db/pool', methods=['GET'])
+def get_pool_stats():
+    """Connection pool usage for this worker process."""
+    return jsonify(pool_stats(db.engine))
+
+@api.route('/api/jobs/facets', methods=['GET'])
+def get_job_facets():
+    """Top values with job counts for company, location, job_type and tag,
+    scoped to the listing filters (see listing.facet_counts)."""
+    try:
+        rows = db.session.execute(top_facets(request.args))
+        return jsonify(facets_response(rows))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/jobs', methods=['POST'])
-def create_job():
+@api.route('/api/jobs/changes', methods=['GET'])
+def get_job_changes():
+    """Inserts, updates and deletes after the `since` token, oldest first (see changes.py)."""
     try:
-        data = request.json
-        current_time = datetime.utcnow()
-
-        new_job = Job(
-            title=data['title'],
-            company=data['company'],
-            location=data.get('location', ''),
-            job_type=data.get('job_type', ''),
-            tags=data.get('tags', ''),
-            date_posted=data.get('date_posted', current_time.strftime('%Y-%m-%d')),
-            link=data.get('link', ''),
-            logo=data.get('logo', ''),
-            created_at=current_time
+        since, limit = changes_params(request.args)
+        start = check_since(since, *db.session.execute(CHANGE_LOG_STATE_QUERY).one())
+        rows = [] if since is None else db.session.execute(changes_after(start, limit)).all()
+        return jsonify(changes_response(rows, start, limit))
+    except ChangesPruned as e:
+        return jsonify({'error': str(e)}), 410
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/jobs/export', methods=['GET'])
+def export_jobs():
+    """Stream every job matching the listing filters as NDJSON or CSV.
+
+    Rows come from a server-side cursor as plain column tuples and are
+    encoded straight into the response, so memory use does not grow with
+    the table. The body is gzipped on the fly when the client accepts it.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported format '{export_format}', expected one of {sorted(EXPORT_FORMATS)}"}), 400
+
+    try:
+        query = (
+            apply_filters(db.session.query(*JOB_COLUMNS), request.args)
+            .order_by(Job.id)
+            .yield_per(EXPORT_BATCH_SIZE)
         )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    mimetype, encode = EXPORT_FORMATS[export_format]
+    body = encode(query)
+
+    headers = {'Content-Disposition': f'attachment; filename=jobs.{export_format}'}
+    if request.accept_encodings['gzip']:
+        body = gzip_stream(body)
+        headers['Content-Encoding'] = 'gzip'
+
+    return current_app.response_class(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+@api.route('/api/jobs', methods=['POST'])
+def create_job():
+    try:
+        # Validated and defaulted like every row of POST /api/jobs/bulk
+        new_job = Job(**validate_job_row(request.get_json(silent=True), datetime.utcnow()))
         db.session.add(new_job)
         db.session.commit()
+        job_cache.invalidate()
 
-        # Calculate which page this job will appear on
+        # Calculate which page this job will appear on, using the trigger-maintained row count
         per_page = 10  # Default page size
-        total_jobs = Job.query.count()
+        _, total_jobs, _ = get_dataset_version()
         total_pages = (total_jobs + per_page - 1) // per_page if total_jobs > 0 else 1
 
-        # The new job will be on the first page since we're not ordering by created_at anymore
+        # Jobs are listed newest first, so the new job is on the first page
         job_page = 1
 
         return jsonify({
@@ -143,18 +253,71 @@ def create_job():
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
-@app.route('/api/jobs/<int:job_id>', methods=['DELETE'])
+@api.route('/api/jobs/bulk', methods=['POST'])
+def create_jobs_bulk():
+    """Insert jobs from an NDJSON or JSON-array body.
+
+    Rows are validated as they are read and inserted in chunks of
+    BULK_CHUNK_SIZE; duplicates of existing (title, company) pairs are
+    skipped. The response streams one NDJSON result per input row followed
+    by a summary line, so neither side has to hold the whole payload.
+    Invalid rows are reported immediately, so results can arrive ahead of
+    earlier rows that are still waiting in a chunk.
+    """
+    def generate():
+        now = datetime.utcnow()
+        summary = {'inserted': 0, 'duplicate': 0, 'invalid': 0}
+        chunk = []
+
+        def flush():
+            returned = insert_job_rows(db.session, [row for _, row in chunk])
+            db.session.commit()
+            inserted = {(title, company): job_id for job_id, title, company in returned}
+            if inserted:
+                job_cache.invalidate()
+
+            for row_number, row in chunk:
+                job_id = inserted.pop((row['title'], row['company']), None)
+                status = 'inserted' if job_id is not None else 'duplicate'
+                summary[status] += 1
+                yield ndjson_line({'row': row_number, 'status': status, 'id': job_id})
+            chunk.clear()
+
+        try:
+            for row_number, (data, error) in enumerate(iter_json_rows(request.stream), start=1):
+                if error is None:
+                    try:
+                        chunk.append((row_number, validate_job_row(data, now)))
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    summary['invalid'] += 1
+                    yield ndjson_line({'row': row_number, 'status': 'invalid', 'error': error})
+
+                if len(chunk) >= BULK_CHUNK_SIZE:
+                    yield from flush()
+            yield from flush()
+        except Exception as e:
+            db.session.rollback()
+            yield ndjson_line({'error': str(e)})
+
+        yield ndjson_line({'summary': summary})
+
+    return current_app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@api.route('/api/jobs/<int:job_id>', methods=['DELETE'])
 def delete_job(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if job is None:
             return jsonify({'error': 'Job not found'}), 404
         db.session.delete(job)
         db.session.commit()
+        job_cache.invalidate()
         return '', 204
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""Async read API for GET /api/jobs, GET /api/jobs/facets and GET /api/jobs/changes.
+
+Serves the same responses as app.py from an asyncpg connection pool, so a
+burst of slow listing requests waits on the event loop instead of holding
+a worker thread per request. The count and page queries of a listing run
+concurrently on separate connections. Writes and exports stay on the sync
+app; route these GET paths here from the reverse proxy.
+
+    hypercorn -w 4 -b 0.0.0.0:5001 async_app:app
+"""
+import asyncio
+from datetime import timezone
+from quart import Quart, request, jsonify
+from sqlalchemy.ext.asyncio import create_async_engine
+from cache import create_cache
+from changes import CHANGE_LOG_STATE_QUERY, ChangesPruned, changes_params, check_since, changes_after, changes_response
+from database import ASYNC_DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, async_engine_options, pool_stats
+from listing import (
+    DATASET_VERSION_QUERY, count_statement, page_params, page_listing, clamp_page, page_slice, page_response,
+    is_cursor_request, cursor_params, cursor_listing, after_cursor, cursor_response, listing_etag,
+    is_not_modified, top_facets, facets_response, use_fast_json
+)
+
+app = Quart(__name__)
+use_fast_json(app)
+
+engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_options())
+
+# A listing uses two connections at once. Admitting at most half the pool
+# means an admitted request never waits for its second connection, and
+# excess requests queue here in arrival order rather than on the pool.
+listing_slots = asyncio.Semaphore(max((DB_POOL_SIZE + DB_MAX_OVERFLOW) // 2, 1))
+
+# Cache for GET /api/jobs responses; writes on the sync app reach it through the dataset version
+job_cache = create_cache()
+
+@app.after_request
+async def allow_cors(response):
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+@app.after_serving
+async def dispose_engine():
+    await engine.dispose()
+
+# Query helpers. A listing holds one connection for the version check and
+# the count, and borrows a second one to fetch the page at the same time.
+async def fetch_all(statement):
+    async with engine.connect() as conn:
+        return (await conn.execute(statement)).all()
+
+async def fetch_scalar(conn, statement):
+    return await conn.scalar(statement)
+
+async def no_total():
+    return None
+
+async def list_jobs(conn, args):
+    if is_cursor_request(args):
+        return await list_jobs_by_cursor(conn, args)
+
+    page, per_page = page_params(args)
+    query = page_listing(args)
+
+    # Fetch the requested page while counting; only an out-of-range page
+    # needs a second round trip once the total is known
+    requested = max(page, 1)
+    total_jobs, jobs = await asyncio.gather(
+        fetch_scalar(conn, count_statement(query)),
+        fetch_all(page_slice(query, requested, per_page))
+    )
+    page, total_pages = clamp_page(page, per_page, total_jobs)
+    if page != requested:
+        jobs = (await conn.execute(page_slice(query, page, per_page))).all()
+
+    return page_response(jobs, total_jobs, page, per_page, total_pages)
+
+async def list_jobs_by_cursor(conn, args):
+    limit, cursor, include_total, key = cursor_params(args)
+    query = cursor_listing(args)
+    page_query = after_cursor(query, cursor, limit, key)
+
+    if not include_total:
+        return cursor_response((await conn.execute(page_query)).all(), limit, key)
+    total, jobs = await asyncio.gather(fetch_scalar(conn, count_statement(query)), fetch_all(page_query))
+    return cursor_response(jobs, limit, key, total)
+
+# Routes
+@app.route('/api/jobs', methods=['GET'])
+async def get_jobs():
+    try:
+        async with listing_slots, engine.connect() as conn:
+            return await listing_response(conn)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+async def listing_response(conn):
+    version, _, updated_at = (await conn.execute(DATASET_VERSION_QUERY)).one()
+    etag = listing_etag(version, request.args)
+    last_modified = updated_at.replace(microsecond=0, tzinfo=timezone.utc)
+
+    if is_not_modified(request, etag, last_modified):
+        response = app.response_class('', status=304)
+    else:
+        cache_key = job_cache.key(request.args, version)
+        body = job_cache.get(cache_key)
+        if body is None:
+            body = app.json.dumps(await list_jobs(conn, request.args))
+            job_cache.set(cache_key, body)
+        response = app.response_class(body, mimetype='application/json')
+
+    # Clients may keep the body but must revalidate it on every poll
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+@app.route('/api/jobs/facets', methods=['GET'])
+async def get_job_facets():
+    try:
+        rows = await fetch_all(top_facets(request.args))
+        return jsonify(facets_response(rows))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/changes', methods=['GET'])
+async def get_job_changes():
+    try:
+        since, limit = changes_params(request.args)
+        async with engine.connect() as conn:
+            start = check_since(since, *(await conn.execute(CHANGE_LOG_STATE_QUERY)).one())
+            rows = [] if since is None else (await conn.execute(changes_after(start, limit))).all()
+        return jsonify(changes_response(rows, start, limit))
+    except ChangesPruned as e:
+        return jsonify({'error': str(e)}), 410
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/db/pool', methods=['GET'])
+async def get_pool_stats():
+    return jsonify(pool_stats(engine.sync_engine))
+
+if __name__ == '__main__':
+    app.run(port=5001)
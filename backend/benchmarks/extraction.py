@@ -0,0 +1,51 @@
+"""Compare per-page card extraction time between the Selenium modes.
+
+Loads the saved listing page in headless Chrome and times the single
+execute_script extraction against the per-element WebDriver path.
+
+Run from the backend directory:
+
+    python -m benchmarks.extraction --runs 20
+"""
+import argparse
+import os
+import statistics
+import time
+
+from job_scraper import SeleniumEngine
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'actuarylist_page.html')
+
+def time_extraction(extract, runs):
+    timings = []
+    cards = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        cards = len(extract())
+        timings.append((time.perf_counter() - start) * 1000)
+    return cards, timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--fixture', default=FIXTURE)
+    args = parser.parse_args()
+
+    engine = SeleniumEngine()
+    engine.open()
+    try:
+        engine.driver.get(f"file://{os.path.abspath(args.fixture)}")
+
+        modes = [
+            ('elements', engine.extract_cards_elements),
+            ('script', engine.extract_cards_script),
+        ]
+        print(f"{'mode':<10} {'cards':>6} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+        for name, extract in modes:
+            cards, timings = time_extraction(extract, args.runs)
+            print(f"{name:<10} {cards:>6} {statistics.median(timings):>10.2f} {min(timings):>8.2f} {max(timings):>8.2f}")
+    finally:
+        engine.close()
+
+if __name__ == '__main__':
+    main()
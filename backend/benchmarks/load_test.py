@@ -0,0 +1,115 @@
+"""Load-test GET /api/jobs on the sync and async APIs and compare latency.
+
+Opens `--clients` keep-alive connections per target and has each one send
+`--requests` listing requests, cycling through a mix of page, cursor,
+filter and search queries. Prints p50/p95/p99 latency and throughput per
+target. Start both servers with the response cache off so every request
+reaches Postgres:
+
+    CACHE_BACKEND=none gunicorn -c gunicorn.conf.py wsgi:app
+    CACHE_BACKEND=none hypercorn -w 4 -b 0.0.0.0:5001 async_app:app
+
+Then run from the backend directory:
+
+    python -m benchmarks.load_test --clients 500 \\
+        --target sync=http://localhost:5000 --target async=http://localhost:5001
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+PATHS = (
+    '/api/jobs?page=1&per_page=10',
+    '/api/jobs?page=5&per_page=20',
+    '/api/jobs?limit=20',
+    '/api/jobs?limit=20&include_total=1',
+    '/api/jobs?location=New%20York',
+    '/api/jobs?tag=Life&tag=Health',
+    '/api/jobs?q=actuary&per_page=10',
+    '/api/jobs/facets?limit=10',
+)
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+    headers = {name.lower(): value for name, value in headers.items()}
+
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status, headers.get('connection', '').lower() == 'close'
+
+async def run_client(host, port, paths, latencies, errors):
+    reader = writer = None
+    for path in paths:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode())
+            status, closed = await read_response(reader)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append(status)
+            if closed:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            errors.append(type(e).__name__)
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+async def load_test(url, clients, requests):
+    parts = urlsplit(url)
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(
+            parts.hostname, parts.port or 80,
+            [PATHS[(i + n) % len(PATHS)] for n in range(requests)],
+            latencies, errors
+        )
+        for i in range(clients)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+def percentile(values, p):
+    return values[min(int(len(values) * p / 100), len(values) - 1)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', action='append', metavar='NAME=URL', required=True)
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=20, help='Requests per client')
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients x {args.requests} requests")
+    print(f"{'target':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'req/s':>8} {'errors':>7}")
+    for target in args.target:
+        name, url = target.split('=', 1)
+        latencies, errors, elapsed = asyncio.run(load_test(url, args.clients, args.requests))
+        latencies.sort()
+        if not latencies:
+            print(f"{name:<8} no successful requests, {len(errors)} errors")
+            continue
+        print(
+            f"{name:<8} {percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f} "
+            f"{percentile(latencies, 99):>8.1f} {statistics.mean(latencies):>8.1f} "
+            f"{len(latencies) / elapsed:>8.0f} {len(errors):>7}"
+        )
+
+if __name__ == '__main__':
+    main()
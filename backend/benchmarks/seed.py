@@ -0,0 +1,119 @@
+"""Fill the jobs table with deterministic synthetic jobs for benchmarks.
+
+Rows are streamed into Postgres with COPY, so the generated columns,
+indexes and statement-level triggers are maintained exactly as for real
+inserts. Existing jobs are truncated first, so the seeded database is the
+benchmark one (see benchmarks.suite) unless --database-url names another.
+
+Run from the backend directory:
+
+    python -m benchmarks.seed --rows 100000
+"""
+import io
+import os
+import csv
+import random
+import argparse
+import time
+from datetime import datetime, timedelta
+
+LEVELS = ('Junior', 'Associate', 'Senior', 'Lead', 'Principal', 'Chief', 'Assistant', 'Staff')
+ROLES = (
+    'Actuary', 'Actuarial Analyst', 'Pricing Actuary', 'Reserving Actuary', 'Capital Modelling Actuary',
+    'Actuarial Consultant', 'Data Scientist', 'Underwriter', 'Risk Analyst', 'Valuation Actuary'
+)
+LOCATIONS = (
+    'New York', 'London', 'Chicago', 'Boston', 'Hartford', 'Toronto', 'Zurich', 'Dublin', 'Singapore',
+    'Hong Kong', 'Sydney', 'Paris', 'Munich', 'Bermuda', 'Des Moines', 'Philadelphia', 'Atlanta',
+    'Dallas', 'San Francisco', 'Seattle', 'Remote', 'Edinburgh', 'Manchester', 'Amsterdam', 'Mumbai'
+)
+TAGS = (
+    'Life', 'Health', 'Pensions', 'P&C', 'Reinsurance', 'Pricing', 'Reserving', 'Capital', 'IFRS 17',
+    'Solvency II', 'Python', 'R', 'SQL', 'Excel', 'Prophet', 'ResQ', 'Modelling', 'Entry Level',
+    'Qualified', 'Part-Qualified', 'Consulting', 'Investments', 'ALM', 'Predictive Analytics'
+)
+JOB_TYPES = ('Full-time', 'Part-time', 'Contract', 'Internship', 'Remote', '')
+COMPANY_COUNT = 2000
+
+COPY_COLUMNS = (
+    'title', 'company', 'location', 'job_type', 'tags', 'date_posted', 'posted_on', 'link', 'logo', 'created_at'
+)
+
+def generate_jobs(count, seed=42, now=None):
+    """Yield `count` job rows in COPY_COLUMNS order, the same for every run."""
+    rng = random.Random(seed)
+    now = now or datetime(2025, 1, 1)
+    for i in range(count):
+        company = f"Company {rng.randrange(COMPANY_COUNT)}"
+        posted_days = rng.randrange(60)
+        created_at = now - timedelta(seconds=rng.randrange(365 * 86400))
+        yield (
+            f"{rng.choice(LEVELS)} {rng.choice(ROLES)} R{i}",
+            company,
+            ", ".join(rng.sample(LOCATIONS, rng.choice((1, 1, 1, 2, 3)))),
+            rng.choice(JOB_TYPES),
+            ", ".join(rng.sample(TAGS, rng.randint(1, 4))),
+            f"{posted_days}d ago" if posted_days else "today",
+            (created_at.date() - timedelta(days=posted_days)).isoformat(),
+            f"https://www.actuarylist.com/jobs/{i}",
+            f"https://cdn.example.com/logos/{company.split()[-1]}.png",
+            created_at.isoformat(sep=' '),
+        )
+
+def copy_chunks(rows, chunk_rows=50000):
+    """CSV text for COPY, `chunk_rows` rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if i % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def seed_jobs(engine, count, seed=42):
+    """Replace every job with `count` synthetic ones. Returns the elapsed seconds."""
+    start = time.perf_counter()
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE jobs RESTART IDENTITY")
+            for chunk in copy_chunks(generate_jobs(count, seed)):
+                cur.copy_expert(f"COPY jobs ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", io.StringIO(chunk))
+        conn.commit()
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE jobs")
+        conn.commit()
+    finally:
+        conn.close()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--database-url', help='Database whose jobs are replaced; defaults to the benchmark database, never DATABASE_URL'
+    )
+    args = parser.parse_args()
+
+    from benchmarks.suite import bench_database_url, create_bench_database
+
+    # Point the app modules at the seeded database before they are imported
+    os.environ['DATABASE_URL'] = args.database_url or bench_database_url()
+    if not args.database_url:
+        import job_scraper
+
+        create_bench_database(os.environ['DATABASE_URL'])
+        job_scraper.create_tables().dispose()
+
+    from database import make_engine
+
+    engine = make_engine(0)
+    print(f"Seeding {engine.url.render_as_string(hide_password=True)}")
+    elapsed = seed_jobs(engine, args.rows, args.seed)
+    print(f"Seeded {args.rows} jobs in {elapsed:.1f} seconds ({args.rows / elapsed:.0f} rows/s)")
+
+if __name__ == '__main__':
+    main()
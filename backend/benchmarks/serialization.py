@@ -0,0 +1,93 @@
+"""Compare per-page serialization cost of the old and new listing paths.
+
+The old path builds a Job instance per row, turns it into a dict with a
+per-row utcnow() fallback and encodes the page with the standard json
+module. The new path takes plain column tuples (as selected with
+JOB_COLUMNS), builds dicts with job_rows_to_dicts and encodes them with
+the app's JSON provider (orjson when installed). Database time is not
+included.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization --runs 200
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from models import Job, JOB_FIELDS, job_rows_to_dicts
+
+PAGE_SIZES = (10, 100, 1000)
+
+def make_rows(count):
+    now = datetime.utcnow()
+    return [
+        (
+            i, f"Actuarial Analyst {i}", f"Company {i % 50}", "New York, London", "Full-time",
+            "Life, Health, Pricing", "" if i % 3 else "3d ago", (now - timedelta(days=i % 30)).date(),
+            f"https://www.actuarylist.com/jobs/{i}",
+            f"https://cdn.example.com/logo/{i % 50}.png", now - timedelta(minutes=i)
+        )
+        for i in range(count)
+    ]
+
+def legacy_to_dict(job):
+    # Job.to_dict as it was before the column-tuple path
+    return {
+        'id': job.id,
+        'title': job.title,
+        'company': job.company,
+        'location': job.location,
+        'job_type': job.job_type,
+        'tags': job.tags,
+        'date_posted': job.date_posted or datetime.utcnow().strftime('%Y-%m-%d'),
+        'posted_on': job.posted_on.isoformat() if job.posted_on else None,
+        'link': job.link,
+        'logo': job.logo,
+        'created_at': job.created_at.isoformat() if job.created_at else None
+    }
+
+def serialize_orm(rows):
+    jobs = [Job(**dict(zip(JOB_FIELDS, row))) for row in rows]
+    return json.dumps({'jobs': [legacy_to_dict(job) for job in jobs]}, sort_keys=True)
+
+def serialize_rows(rows, dumps):
+    return dumps({'jobs': job_rows_to_dicts(rows)})
+
+def time_serializer(serialize, rows, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        serialize(rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    from app import create_app
+    app = create_app(migrations=False)
+
+    paths = [
+        ('orm + json', serialize_orm),
+        (f'tuples + {type(app.json).__name__}', lambda rows: serialize_rows(rows, app.json.dumps)),
+    ]
+
+    print(f"{'rows':>6}  {'path':<32} {'median ms':>10} {'p95 ms':>8} {'us/row':>8}")
+    for size in PAGE_SIZES:
+        rows = make_rows(size)
+        medians = []
+        for name, serialize in paths:
+            timings = sorted(time_serializer(serialize, rows, args.runs))
+            median = statistics.median(timings)
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            medians.append(median)
+            print(f"{size:>6}  {name:<32} {median:>10.3f} {p95:>8.3f} {median * 1000 / size:>8.2f}")
+        print(f"{'':>6}  speedup {medians[0] / medians[1]:.1f}x")
+
+if __name__ == '__main__':
+    main()
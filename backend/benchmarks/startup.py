@@ -0,0 +1,145 @@
+"""Measure the startup cost of the API workers, the scraper and the CLI commands.
+
+Every target runs in a fresh interpreter under `python -X importtime`,
+which reports the time spent importing each module. The report shows,
+per target, the median total import time and wall time over --repeat
+runs, the number of modules imported, and the heaviest third-party and
+standard library packages it loads. Heavy dependencies that a target is not supposed to load
+(see UNEXPECTED) are flagged.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --compare startup.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+from benchmarks.suite import git_commit, change
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (name, code run at startup): what each process or command imports before it does any work
+TARGETS = (
+    ('cli --help', 'import cli'),
+    ('api worker (wsgi)', 'import wsgi'),
+    ('async api worker', 'import async_app'),
+    ('flask db', 'from app import create_app; create_app()'),
+    ('cli scrape', 'import job_scraper'),
+    ('cli backfill', 'import classifier'),
+    ('cli stats', 'import sqlalchemy, database, changes, models'),
+)
+
+# Modules a target should not import; found ones are listed in the report
+UNEXPECTED = {
+    'cli --help': ('sqlalchemy', 'flask', 'selenium', 'requests'),
+    'api worker (wsgi)': ('alembic', 'selenium', 'requests', 'lxml'),
+    'cli scrape': ('flask', 'alembic', 'selenium', 'requests', 'lxml'),
+    'cli backfill': ('flask', 'alembic', 'selenium', 'requests'),
+    'cli stats': ('flask', 'alembic', 'selenium', 'requests'),
+}
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from `-X importtime` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+def run_target(code):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"'{code}' failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), wall_ms
+
+def bare_modules():
+    """Modules a bare interpreter imports at startup, left out of the heaviest imports."""
+    modules, _ = run_target('pass')
+    return {module for module, _, _, _ in modules}
+
+def is_project_module(name):
+    path = os.path.join(BACKEND_DIR, name)
+    return os.path.exists(path + '.py') or os.path.isdir(path)
+
+def bench_target(name, code, repeat, top, startup):
+    import_ms = []
+    wall_ms = []
+    for _ in range(repeat):
+        modules, wall = run_target(code)
+        import_ms.append(sum(self_us for _, self_us, _, _ in modules) / 1000)
+        wall_ms.append(wall)
+
+    names = {module for module, _, _, _ in modules}
+    packages = [
+        m for m in modules
+        if '.' not in m[0] and m[0] not in startup and not is_project_module(m[0])
+    ]
+    heaviest = sorted(packages, key=lambda m: m[2], reverse=True)[:top]
+    return {
+        'name': name,
+        'import_ms': round(statistics.median(import_ms), 1),
+        'wall_ms': round(statistics.median(wall_ms), 1),
+        'modules': len(names),
+        'heaviest': [{'module': module, 'cumulative_ms': round(cumulative_us / 1000, 1)} for module, _, cumulative_us, _ in heaviest],
+        'unexpected': [module for module in UNEXPECTED.get(name, ()) if module in names],
+    }
+
+def print_report(report, baseline=None):
+    previous = {result['name']: result for result in baseline['targets']} if baseline else {}
+    print(f"commit {report['commit']}  {report['created_at']}  python {report['python']}")
+    print(f"  {'target':<20} {'import ms':>10} {'wall ms':>9} {'modules':>8}  {'vs baseline':>11}  heaviest packages (cumulative ms)")
+    for result in report['targets']:
+        delta = change(result['import_ms'], previous.get(result['name'], {}).get('import_ms'))
+        heaviest = ', '.join(f"{item['module']} {item['cumulative_ms']}" for item in result['heaviest'])
+        print(
+            f"  {result['name']:<20} {result['import_ms']:>10} {result['wall_ms']:>9} {result['modules']:>8}  "
+            f"{delta:>11}  {heaviest}"
+        )
+        if result['unexpected']:
+            print(f"  {'':<20} imports {', '.join(result['unexpected'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per target; medians are reported')
+    parser.add_argument('--top', type=int, default=3, help='Heaviest packages to show per target')
+    parser.add_argument('--target', action='append', help='Only measure this target (repeatable)')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Earlier JSON results to compare against')
+    args = parser.parse_args()
+
+    targets = [(name, code) for name, code in TARGETS if not args.target or name in args.target]
+    startup = bare_modules()
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'targets': [bench_target(name, code, args.repeat, args.top, startup) for name, code in targets],
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""Benchmark the API and the scraper pipeline against seeded datasets.
+
+For every dataset size the jobs table is reseeded (see benchmarks.seed),
+then the suite measures:
+
+- GET /api/jobs at several filters and page depths, and GET /api/jobs/facets,
+  through the Flask app in-process with the response cache off;
+- POST /api/jobs (one row per request) and POST /api/jobs/bulk throughput;
+- scraper parsing of the saved listing page and dedup + insert of its cards.
+
+Latency results are reported as p50/p95/p99 in milliseconds. Throughput
+results are reported in rows per second. The full results are written as
+JSON, so two commits can be compared with --compare.
+
+Benchmarks run against a separate database, `<POSTGRES_DB>_bench` unless
+BENCH_DATABASE_URL is set. It is created with the app's schema when
+missing and is overwritten on every run. Run from the backend directory:
+
+    python -m benchmarks.suite --rows 10000 100000 1000000 --output bench.json
+    python -m benchmarks.suite --rows 10000 --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'actuarylist_page.html')
+
+def bench_database_url():
+    """BENCH_DATABASE_URL, or the app's database URL with `_bench` appended to the name.
+
+    Worked out in a subprocess, because importing `database` here would fix
+    DATABASE_URL for the app and scraper imported afterwards.
+    """
+    if os.getenv("BENCH_DATABASE_URL"):
+        return os.getenv("BENCH_DATABASE_URL")
+    url = subprocess.run(
+        [sys.executable, '-c', 'from database import DATABASE_URL; print(DATABASE_URL)'],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return url + '_bench'
+
+def create_bench_database(url):
+    import psycopg2
+
+    base, name = url.rsplit('/', 1)
+    conn = psycopg2.connect(f"{base}/postgres")
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (name,))
+        if not cur.fetchone():
+            cur.execute(f'CREATE DATABASE "{name}"')
+    conn.close()
+
+# ---------- MEASUREMENT ----------
+def summarize(latencies_ms, elapsed, rows=None):
+    ordered = sorted(latencies_ms)
+    cuts = statistics.quantiles(ordered, n=100, method='inclusive') if len(ordered) > 1 else ordered * 99
+    result = {
+        'requests': len(ordered),
+        'p50_ms': round(cuts[49], 3),
+        'p95_ms': round(cuts[94], 3),
+        'p99_ms': round(cuts[98], 3),
+        'mean_ms': round(statistics.mean(ordered), 3),
+        'requests_per_s': round(len(ordered) / elapsed, 1),
+    }
+    if rows is not None:
+        result['rows_per_s'] = round(rows / elapsed, 1)
+    return result
+
+def time_requests(send, count, warmup=3):
+    for _ in range(warmup):
+        send()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(count):
+        request_start = time.perf_counter()
+        send()
+        latencies.append((time.perf_counter() - request_start) * 1000)
+    return latencies, time.perf_counter() - start
+
+def check(response):
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+# ---------- API ----------
+def listing_scenarios(client, rows):
+    """(name, path) pairs covering filters, offset depth and cursor depth."""
+    per_page = 20
+    deep_page = max(rows // per_page // 2, 1)
+    # Walk the cursor to roughly the middle of the table with large pages
+    cursor = None
+    for _ in range(min(rows // 2 // 100, 50)):
+        path = '/api/jobs?limit=100' + (f'&cursor={cursor}' if cursor else '')
+        cursor = check(client.get(path)).get_json()['pagination']['next_cursor']
+
+    scenarios = [
+        ('page 1', f'/api/jobs?page=1&per_page={per_page}'),
+        (f'page {deep_page}', f'/api/jobs?page={deep_page}&per_page={per_page}'),
+        ('cursor first', f'/api/jobs?limit={per_page}'),
+        ('cursor first + total', f'/api/jobs?limit={per_page}&include_total=1'),
+        ('location substring', f'/api/jobs?location=London&per_page={per_page}'),
+        ('two locations', f'/api/jobs?location=London&location=Zurich&per_page={per_page}'),
+        ('two tags', f'/api/jobs?tag=Life&tag=Pricing&per_page={per_page}'),
+        ('company', f'/api/jobs?company=Company%2012&per_page={per_page}'),
+        ('search q', f'/api/jobs?q=pricing%20actuary&per_page={per_page}'),
+        ('sort recent', f'/api/jobs?sort=recent&per_page={per_page}'),
+        ('posted in a week', f'/api/jobs?posted_after=2024-12-01&posted_before=2024-12-07&sort=recent&per_page={per_page}'),
+        ('filters combined', f'/api/jobs?location=London&tag=Life&job_type=Full-time&per_page={per_page}'),
+        ('facets', '/api/jobs/facets'),
+        ('facets filtered', '/api/jobs/facets?tag=Life'),
+    ]
+    if cursor:
+        scenarios.insert(3, ('cursor deep', f'/api/jobs?limit={per_page}&cursor={cursor}'))
+    return scenarios
+
+def bench_get(client, rows, requests):
+    results = []
+    for name, path in listing_scenarios(client, rows):
+        latencies, elapsed = time_requests(lambda: check(client.get(path)), requests)
+        results.append({'name': name, 'path': path, **summarize(latencies, elapsed)})
+    return results
+
+def synthetic_post(i, run_id):
+    return {
+        'title': f"Benchmark Actuary {run_id}-{i}",
+        'company': f"Bench Co {i % 97}",
+        'location': random.choice(('London', 'New York, Chicago', 'Remote')),
+        'job_type': 'Full-time',
+        'tags': 'Life, Pricing',
+        'link': f"https://example.com/bench/{run_id}/{i}",
+    }
+
+def bench_post(client, requests, bulk_rows):
+    run_id = int(time.time() * 1000)
+    counter = iter(range(requests + 10))
+    latencies, elapsed = time_requests(
+        lambda: check(client.post('/api/jobs', json=synthetic_post(next(counter), run_id))), requests
+    )
+    single = {'name': 'POST /api/jobs', **summarize(latencies, elapsed, rows=requests)}
+
+    body = ''.join(json.dumps(synthetic_post(i, f"{run_id}b")) + '\n' for i in range(bulk_rows))
+    start = time.perf_counter()
+    response = check(client.post('/api/jobs/bulk', data=body, content_type='application/x-ndjson'))
+    summary = json.loads(response.get_data(as_text=True).strip().rsplit('\n', 1)[-1])['summary']
+    elapsed = time.perf_counter() - start
+    bulk = {
+        'name': 'POST /api/jobs/bulk',
+        'rows': bulk_rows,
+        'inserted': summary['inserted'],
+        'seconds': round(elapsed, 3),
+        'rows_per_s': round(bulk_rows / elapsed, 1),
+    }
+    return [single, bulk]
+
+# ---------- SCRAPER ----------
+def bench_scraper(engine, runs):
+    import job_scraper
+    from sqlalchemy.orm import Session
+
+    with open(FIXTURE) as f:
+        html = f.read()
+
+    latencies = []
+    cards = 0
+    start = time.perf_counter()
+    for _ in range(runs):
+        parse_start = time.perf_counter()
+        jobs, _ = job_scraper.parse_listing_html(html)
+        latencies.append((time.perf_counter() - parse_start) * 1000)
+        cards += len(jobs)
+    parse = {'name': 'parse page', **summarize(latencies, time.perf_counter() - start, rows=cards)}
+
+    # Persist the page's cards as new jobs each time, as a crawl of fresh pages would
+    run_id = int(time.time() * 1000)
+    latencies = []
+    cards = 0
+    stats = job_scraper.CrawlStats()
+    job_scraper.fingerprint_index.loaded = True
+    with Session(engine) as session:
+        start = time.perf_counter()
+        for i in range(runs):
+            page = [dict(job, title=f"{job['title']} {run_id}-{i}") for job in jobs]
+            persist_start = time.perf_counter()
+            job_scraper.write_batch(session, job_scraper.filter_new_jobs(page, stats), stats)
+            latencies.append((time.perf_counter() - persist_start) * 1000)
+            cards += len(page)
+        persist = {'name': 'dedup + insert page', **summarize(latencies, time.perf_counter() - start, rows=cards)}
+    return [parse, persist]
+
+# ---------- REPORTING ----------
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def result_key(size, section, name):
+    return f"{size}/{section}/{name}"
+
+def flatten(report):
+    for dataset in report['datasets']:
+        for section in ('get', 'post', 'scraper'):
+            for result in dataset[section]:
+                yield result_key(dataset['rows'], section, result['name']), result
+
+def change(new, old):
+    if old is None or not old:
+        return ''
+    return f"{(new - old) / old * 100:+.0f}%"
+
+def print_report(report, baseline=None):
+    previous = dict(flatten(baseline)) if baseline else {}
+    print(f"commit {report['commit']}  {report['created_at']}")
+    for dataset in report['datasets']:
+        print(f"\n{dataset['rows']} rows (seeded in {dataset['seed_seconds']} s, {dataset['seed_rows_per_s']:.0f} rows/s)")
+        print(f"  {'benchmark':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows/s':>10} {'req/s':>9}  {'vs baseline':>11}")
+        for section in ('get', 'post', 'scraper'):
+            for result in dataset[section]:
+                old = previous.get(result_key(dataset['rows'], section, result['name']), {})
+                delta = change(result['p50_ms'], old.get('p50_ms')) if 'p50_ms' in result else change(
+                    result['rows_per_s'], old.get('rows_per_s')
+                )
+                print(
+                    f"  {result['name']:<28} {result.get('p50_ms', ''):>9} {result.get('p95_ms', ''):>9} "
+                    f"{result.get('p99_ms', ''):>9} {result.get('rows_per_s', ''):>10} "
+                    f"{result.get('requests_per_s', ''):>9}  {delta:>11}"
+                )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--requests', type=int, default=50, help='Timed requests per GET scenario')
+    parser.add_argument('--posts', type=int, default=200, help='Timed single-row POSTs')
+    parser.add_argument('--bulk-rows', type=int, default=5000)
+    parser.add_argument('--scraper-runs', type=int, default=50, help='Fixture pages parsed and persisted')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Earlier JSON results to compare against')
+    args = parser.parse_args()
+
+    # Point the app and scraper at the benchmark database before they are imported
+    url = bench_database_url()
+    os.environ['DATABASE_URL'] = url
+    os.environ['CACHE_BACKEND'] = 'none'
+    create_bench_database(url)
+
+    import job_scraper
+    from app import create_app
+    from benchmarks.seed import seed_jobs
+
+    engine = job_scraper.create_tables()
+    client = create_app(migrations=False).test_client()
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'datasets': [],
+    }
+    for rows in args.rows:
+        print(f"Seeding {rows} jobs...", file=sys.stderr)
+        seed_seconds = seed_jobs(engine, rows)
+        print("Running benchmarks...", file=sys.stderr)
+        report['datasets'].append({
+            'rows': rows,
+            'seed_seconds': round(seed_seconds, 2),
+            'seed_rows_per_s': round(rows / seed_seconds, 1),
+            'get': bench_get(client, rows, args.requests),
+            'post': bench_post(client, args.posts, args.bulk_rows),
+            'scraper': bench_scraper(engine, args.scraper_runs),
+        })
+    with engine.connect() as conn:
+        report['postgres'] = conn.exec_driver_sql("SHOW server_version").scalar()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory, redis or none
+CACHE_TTL = int(os.getenv("CACHE_TTL", 60))  # Seconds
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+def normalize_args(args):
+    """Canonical query string for a request's args, ignoring order and empty values."""
+    params = sorted((name, value) for name, values in args.lists() for value in values if value != '')
+    return urlencode(params)
+
+# ---------- BACKENDS ----------
+class MemoryBackend:
+    """Per-process LRU cache with a TTL on every entry.
+
+    `bump_version` only reaches the process that calls it; writes from
+    other processes are picked up through the dataset version that callers
+    pass to `ResponseCache.key`.
+    """
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def get_version(self):
+        return self.version
+
+    def bump_version(self):
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def size(self):
+        return len(self.entries)
+
+class RedisBackend:
+    """Shared cache in Redis. The version counter lives in Redis too, so an
+    invalidation from any process (API workers or the scraper) is seen by
+    all of them. Eviction is left to Redis' maxmemory-policy (allkeys-lru).
+    """
+
+    VERSION_KEY = 'jobs:cache:version'
+
+    def __init__(self, url, ttl):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get_version(self):
+        return int(self.client.get(self.VERSION_KEY) or 0)
+
+    def bump_version(self):
+        self.client.incr(self.VERSION_KEY)
+
+    def get(self, key):
+        value = self.client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key, value):
+        self.client.setex(key, self.ttl, value)
+
+    def size(self):
+        return None
+
+# ---------- RESPONSE CACHE ----------
+class ResponseCache:
+    """Caches serialized listing responses keyed on the normalized query
+    parameters and the current dataset version."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def key(self, args, dataset_version=0):
+        # The database's dataset version makes entries written before another
+        # process changed jobs unreachable, even for the per-process backend
+        return f"jobs:{dataset_version}.{self.backend.get_version()}:{normalize_args(args)}"
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def invalidate(self):
+        try:
+            self.backend.bump_version()
+            self.invalidations += 1
+        except Exception as e:
+            logging.error(f"Cache invalidation failed: {e}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0,
+            'invalidations': self.invalidations,
+            'entries': self.backend.size()
+        }
+
+class NullBackend(MemoryBackend):
+    def __init__(self):
+        super().__init__(ttl=0, max_entries=0)
+
+    def set(self, key, value):
+        pass
+
+CACHE_BACKENDS = {
+    'memory': lambda: MemoryBackend(CACHE_TTL, CACHE_MAX_ENTRIES),
+    'redis': lambda: RedisBackend(CACHE_REDIS_URL, CACHE_TTL),
+    'none': NullBackend,
+}
+
+def create_cache(backend=None):
+    name = backend or CACHE_BACKEND
+    try:
+        return ResponseCache(CACHE_BACKENDS[name]())
+    except KeyError:
+        raise ValueError(f"Unknown CACHE_BACKEND '{name}', expected one of {sorted(CACHE_BACKENDS)}")
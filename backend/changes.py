@@ -0,0 +1,108 @@
+"""Change feed for GET /api/jobs/changes.
+
+Triggers append every insert, update and delete on jobs to job_changes
+(see models.JobChange) with a `seq` that increases in commit order. A
+client keeps the `next_since` of its last response and asks for the
+changes after it, instead of re-downloading listings:
+
+    GET /api/jobs/changes            -> no changes, next_since = the current head
+    GET /api/jobs/changes?since=N    -> up to `limit` changes with seq > N, oldest first
+
+Inserted and updated jobs come with their current fields, so a client
+can apply a response without further requests. Changes older than
+JOB_CHANGES_RETENTION_DAYS are pruned; a token from before the pruned
+range gets 410 Gone and the client must reload the listing.
+"""
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import and_, select, text
+from models import Job, JobChange, JOB_COLUMNS, job_rows_to_dicts
+
+JOB_CHANGES_RETENTION_DAYS = int(os.getenv("JOB_CHANGES_RETENTION_DAYS", 30))  # 0 = keep forever
+DEFAULT_CHANGES = 100
+MAX_CHANGES = 1000
+
+# Latest logged seq and the highest pruned one
+CHANGE_LOG_STATE_QUERY = text(
+    "SELECT (SELECT max(seq) FROM job_changes), changes_pruned_through FROM job_dataset_version WHERE id = 1"
+)
+
+class ChangesPruned(Exception):
+    """The requested changes are older than the retained log."""
+
+def changes_params(args):
+    """Returns (since, limit); since is None when the client has no token yet."""
+    limit = min(max(args.get('limit', DEFAULT_CHANGES, type=int), 1), MAX_CHANGES)
+    since = args.get('since')
+    if since is None:
+        return None, limit
+    try:
+        since = int(since)
+    except ValueError:
+        raise ValueError("'since' must be a token returned as next_since")
+    if since < 0:
+        raise ValueError("'since' must be a token returned as next_since")
+    return since, limit
+
+def check_since(since, latest, pruned_through):
+    """The seq to read after: `since`, or the current head when it is None."""
+    if since is None:
+        return max(latest or 0, pruned_through)
+    if since < pruned_through:
+        raise ChangesPruned(f"Changes up to {pruned_through} have been pruned; reload the job listing")
+    return since
+
+def changes_after(since, limit):
+    # Deleted jobs have no fields; a job deleted after a later insert or
+    # update is shown without fields there too, and its delete follows
+    return (
+        select(JobChange.seq, JobChange.op, JobChange.job_id, JobChange.changed_at, *JOB_COLUMNS)
+        .outerjoin(Job, and_(Job.id == JobChange.job_id, JobChange.op != 'delete'))
+        .where(JobChange.seq > since)
+        .order_by(JobChange.seq)
+        .limit(limit + 1)
+    )
+
+def changes_response(rows, since, limit):
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    jobs = iter(job_rows_to_dicts([row[4:] for row in rows if row[4] is not None]))
+
+    changes = []
+    for seq, op, job_id, changed_at, *job in rows:
+        changes.append({
+            'seq': seq,
+            'op': op,
+            'id': job_id,
+            'changed_at': changed_at.isoformat(),
+            'job': next(jobs) if job[0] is not None else None,
+        })
+    return {
+        'changes': changes,
+        'next_since': rows[-1].seq if rows else since,
+        'has_more': has_more,
+    }
+
+# ---------- RETENTION ----------
+def prune_job_changes(conn, retention_days=JOB_CHANGES_RETENTION_DAYS):
+    """Delete changes older than `retention_days` and record the highest
+    deleted seq. Returns the number of changes deleted.
+
+    Deletes everything up to the newest expired seq, so the retained log
+    is always a complete suffix even when transactions overlapped.
+    """
+    if not retention_days:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    return conn.execute(text("""
+        WITH pruned AS (
+            DELETE FROM job_changes
+            WHERE seq <= (SELECT max(seq) FROM job_changes WHERE changed_at < :cutoff)
+            RETURNING seq
+        ), watermark AS (
+            UPDATE job_dataset_version
+            SET changes_pruned_through = greatest(changes_pruned_through, (SELECT max(seq) FROM pruned))
+            WHERE id = 1
+        )
+        SELECT count(*) FROM pruned
+    """), {'cutoff': cutoff}).scalar()
@@ -0,0 +1,89 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert
+from models import CrawlCheckpoint
+from fingerprints import page_digest
+
+SCRAPE_CHECKPOINT_MAX_AGE = int(os.getenv("SCRAPE_CHECKPOINT_MAX_AGE", 360))  # Minutes an interrupted full crawl stays resumable, 0 = never resume
+
+class CrawlProgress:
+    """Tracks which pages of a crawl are stored and checkpoints them.
+
+    Pages may be parsed out of order (parallel workers) and their cards are
+    written in batches, so a page only counts as done once it is written
+    and so is every page before it: `last_page` is the end of that prefix.
+    With `persist`, the progress is saved in crawl_checkpoints after every
+    write, together with the digest of last_page.
+
+    A resumed crawl starts by re-reading last_page. Its cards are already
+    stored, so this costs one page load, and comparing its digest shows
+    whether the listing shifted while the crawl was interrupted.
+    """
+
+    def __init__(self, source, persist=False, last_page=0, digest=None, started_at=None):
+        self.source = source
+        self.persist = persist
+        self.last_page = last_page
+        self.digest = digest
+        self.started_at = started_at or datetime.utcnow()
+        self.resumed_from = last_page or None
+        self.unwritten = {}  # Page -> digest, parsed since the last write
+        self.written = {}  # Page -> digest, written but after a gap in the prefix
+
+    @classmethod
+    def load(cls, session, source):
+        """Progress of `source`'s interrupted full crawl, or a fresh start."""
+        row = session.get(CrawlCheckpoint, source)
+        if row is None:
+            return cls(source, persist=True)
+        if not SCRAPE_CHECKPOINT_MAX_AGE or row.updated_at < datetime.utcnow() - timedelta(minutes=SCRAPE_CHECKPOINT_MAX_AGE):
+            logging.info(f"Discarding the checkpoint of {source} from {row.updated_at}, starting from page 1.")
+            return cls(source, persist=True)
+        logging.info(f"Resuming the full crawl of {source} started at {row.started_at} after page {row.last_page}.")
+        return cls(source, True, row.last_page, row.page_digest, row.started_at)
+
+    @property
+    def first_page(self):
+        return max(self.last_page, 1)
+
+    def parsed(self, page_number, jobs):
+        digest = page_digest(jobs)
+        self.unwritten[page_number] = digest
+        if page_number == self.resumed_from:
+            if digest == self.digest:
+                logging.info(f"Page {page_number} of {self.source} is unchanged since the checkpoint.")
+            else:
+                logging.info(f"Page {page_number} of {self.source} changed since the checkpoint; the listing has shifted.")
+
+    def pages_written(self, session):
+        """Mark every page parsed so far as stored and save the checkpoint."""
+        self.written.update(self.unwritten)
+        self.unwritten.clear()
+        while self.last_page + 1 in self.written:
+            self.last_page += 1
+            self.digest = self.written.pop(self.last_page)
+        # The anchor page of a resumed crawl is re-read, not new progress
+        self.written.pop(self.resumed_from, None)
+
+        if self.persist and self.last_page:
+            self.save(session)
+
+    def save(self, session):
+        now = datetime.utcnow()
+        values = {
+            'source': self.source, 'last_page': self.last_page, 'page_digest': self.digest,
+            'started_at': self.started_at, 'updated_at': now,
+        }
+        stmt = insert(CrawlCheckpoint).values(values)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[CrawlCheckpoint.source],
+            set_={'last_page': stmt.excluded.last_page, 'page_digest': stmt.excluded.page_digest, 'updated_at': now}
+        ))
+        session.commit()
+
+    def clear(self, session):
+        """Forget the checkpoint once the crawl has finished."""
+        if self.persist:
+            session.query(CrawlCheckpoint).filter_by(source=self.source).delete()
+            session.commit()
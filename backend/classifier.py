@@ -0,0 +1,135 @@
+"""Job type classification from a job's title and location.
+
+The rules are defined once and compiled two ways: as Python regexes for
+labelling jobs in memory at ingest, and as a SQL CASE expression for
+reclassifying stored rows without moving them out of Postgres. Patterns
+are plain lowercase alternations so they mean the same in both, and only
+match whole words: \\b...\\b in Python, \\m...\\M in Postgres, where \\b is
+a backspace.
+
+Reclassify existing rows in id-range batches, one short transaction each:
+
+    python classifier.py --batch-size 5000
+"""
+import os
+import re
+import time
+import logging
+import argparse
+from collections import Counter
+from sqlalchemy import func, or_, case, select, update
+from models import Job
+from database import make_engine
+
+CLASSIFY_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_SIZE", 5000))  # Rows per backfill transaction
+
+# (job_type, words, fields), first match wins; same precedence as the
+# update_job_types migration, where later UPDATEs overwrote earlier ones.
+# Words are whole-word alternations, so "Internal Audit" is no Internship
+# and "Template Designer" no Contract
+JOB_TYPE_RULES = (
+    ('Remote', 'remote', ('title', 'location')),
+    ('Part-time', 'part[ -]time', ('title',)),
+    ('Contract', 'contract(?:ors?|s)?|temp|temporary', ('title',)),
+    ('Internship', 'intern(?:s|ships?)?', ('title',)),
+)
+# For jobs that match no rule
+DEFAULT_JOB_TYPE = 'Full-time'
+
+def python_pattern(words):
+    return rf'\b(?:{words})\b'
+
+def sql_pattern(words):
+    return rf'\m(?:{words})\M'
+
+COMPILED_RULES = tuple((job_type, re.compile(python_pattern(words)), fields) for job_type, words, fields in JOB_TYPE_RULES)
+
+def classify_job_type(title, location):
+    """The job type for a job: the first matching rule, else DEFAULT_JOB_TYPE."""
+    values = {'title': (title or '').lower(), 'location': (location or '').lower()}
+    for rule_type, pattern, fields in COMPILED_RULES:
+        if any(pattern.search(values[field]) for field in fields):
+            return rule_type
+    return DEFAULT_JOB_TYPE
+
+def job_type_sql():
+    """classify_job_type as a SQL expression over the jobs columns."""
+    return case(
+        *(
+            (or_(*(func.lower(getattr(Job, field)).op('~')(sql_pattern(words)) for field in fields)), rule_type)
+            for rule_type, words, fields in JOB_TYPE_RULES
+        ),
+        else_=DEFAULT_JOB_TYPE
+    )
+
+# ---------- BACKFILL ----------
+def next_id_range(conn, after_id, batch_size):
+    """(last id, row count) of the next `batch_size` jobs with id > after_id,
+    read from the primary key index. The count is 0 when none are left."""
+    batch = select(Job.id).where(Job.id > after_id).order_by(Job.id).limit(batch_size).subquery()
+    return conn.execute(select(func.max(batch.c.id), func.count())).one()
+
+def reclassify_id_range(conn, after_id, last_id):
+    """Reclassify jobs with after_id < id <= last_id. Returns the new job
+    types of the rows that changed; unchanged rows are not written, and
+    neither are jobs whose job_type was sent by an API client."""
+    job_type = job_type_sql()
+    stmt = (
+        update(Job.__table__)
+        .where(
+            Job.id > after_id, Job.id <= last_id, Job.job_type_from_client.is_(False),
+            Job.job_type.is_distinct_from(job_type)
+        )
+        .values(job_type=job_type)
+        .returning(Job.job_type)
+    )
+    return [row.job_type for row in conn.execute(stmt)]
+
+def backfill_job_types(engine, batch_size=CLASSIFY_BATCH_SIZE, pause=0, dry_run=False):
+    """Reclassify every job, committing after each id range of `batch_size` rows.
+
+    Each range is its own transaction, so only the rows it changes are
+    locked and only for as long as that range takes. Returns (scanned,
+    changed_by_type, seconds).
+    """
+    changed = Counter()
+    scanned = 0
+    after_id = 0
+    start = time.perf_counter()
+    while True:
+        with engine.connect() as conn:
+            last_id, rows = next_id_range(conn, after_id, batch_size)
+            if not rows:
+                break
+            range_changed = reclassify_id_range(conn, after_id, last_id)
+            if dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+
+        changed.update(range_changed)
+        scanned += rows
+        logging.info(f"Job types: ids {after_id + 1}-{last_id}, {rows} rows, {len(range_changed)} changed")
+        after_id = last_id
+        if pause:
+            time.sleep(pause)
+
+    return scanned, changed, time.perf_counter() - start
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Reclassify the job_type of every stored job.")
+    parser.add_argument('--batch-size', type=int, default=CLASSIFY_BATCH_SIZE, help='Rows per transaction')
+    parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+    parser.add_argument('--dry-run', action='store_true', help='Count the changes without saving them')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    scanned, changed, seconds = backfill_job_types(make_engine(), args.batch_size, args.pause, args.dry_run)
+    rate = scanned / seconds if seconds else 0
+    print(f"Scanned {scanned} jobs in {seconds:.1f} seconds ({rate:.0f} rows/s), "
+          f"{sum(changed.values())} {'would change' if args.dry_run else 'changed'}")
+    for job_type, count in changed.most_common():
+        print(f"  {job_type}: {count}")
+
+if __name__ == '__main__':
+    main()
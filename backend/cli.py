@@ -0,0 +1,118 @@
+"""Command line entry point for the API, the scraper and admin tasks.
+
+    python cli.py serve [--host 0.0.0.0] [--port 5000] [--debug]
+    python cli.py scrape                      # every source on its schedule
+    python cli.py scrape --once [--full] [--source NAME]
+    python cli.py backfill [--batch-size N] [--pause S] [--dry-run]
+    python cli.py stats [--top N]
+
+Each command imports only what it uses: `stats` never loads Flask or a
+browser driver, and `scrape` never loads Flask. `python -m
+benchmarks.startup` measures the import time of every command.
+"""
+import sys
+import argparse
+
+def serve(args):
+    from app import create_app
+
+    create_app(migrations=False).run(host=args.host, port=args.port, debug=args.debug)
+
+def scrape(args):
+    import job_scraper
+
+    sources = job_scraper.load_sources()
+    if args.source:
+        unknown = set(args.source) - {source.name for source in sources}
+        if unknown:
+            raise SystemExit(f"Unknown source(s): {', '.join(sorted(unknown))}")
+        sources = [source for source in sources if source.name in args.source]
+
+    job_scraper.init_database()
+    if not args.once:
+        job_scraper.start_scraper_exporter()
+        job_scraper.start_scheduler(sources)
+        return 0
+
+    failed = job_scraper.scrape_once(sources, full=args.full)
+    if failed:
+        print(f"Crawl failed for {', '.join(failed)}; see scraper.log", file=sys.stderr)
+        return 1
+    return 0
+
+def backfill(args):
+    import classifier
+
+    classifier.main(args.backfill_args, prog='cli.py backfill')
+
+def stats(args):
+    """Summary of the stored jobs from the trigger-maintained counters, so it
+    returns straight away however large the table is."""
+    from sqlalchemy import select
+    from database import make_engine
+    from changes import CHANGE_LOG_STATE_QUERY
+    from models import CrawlCheckpoint, JobDatasetVersion, JobFacetCount
+
+    with make_engine().connect() as conn:
+        version, row_count, updated_at = conn.execute(
+            select(JobDatasetVersion.version, JobDatasetVersion.row_count, JobDatasetVersion.updated_at)
+        ).one()
+        latest_change, pruned_through = conn.execute(CHANGE_LOG_STATE_QUERY).one()
+        print(f"Jobs: {row_count} (dataset version {version}, last write {updated_at:%Y-%m-%d %H:%M:%S} UTC)")
+        print(f"Change log: seq {pruned_through + 1}-{latest_change or pruned_through}")
+
+        for facet in ('job_type', 'company', 'location', 'tag'):
+            rows = conn.execute(
+                select(JobFacetCount.value, JobFacetCount.count)
+                .where(JobFacetCount.facet == facet, JobFacetCount.count > 0)
+                .order_by(JobFacetCount.count.desc(), JobFacetCount.value)
+                .limit(args.top)
+            ).all()
+            print(f"\nTop {facet} values:")
+            for value, count in rows:
+                print(f"  {value}: {count}")
+
+        checkpoints = conn.execute(select(CrawlCheckpoint).order_by(CrawlCheckpoint.source)).all()
+        if checkpoints:
+            print("\nInterrupted full crawls:")
+            for checkpoint in checkpoints:
+                print(f"  {checkpoint.source}: page {checkpoint.last_page}, updated {checkpoint.updated_at:%Y-%m-%d %H:%M:%S} UTC")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='cli.py', description="Job listings API, scraper and admin commands.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='Run the API on the Flask development server')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=5000)
+    serve_parser.add_argument('--debug', action='store_true')
+    serve_parser.set_defaults(handler=serve)
+
+    scrape_parser = commands.add_parser('scrape', help='Crawl the sources on their schedule, or once')
+    scrape_parser.add_argument('--once', action='store_true', help='Crawl every source once and exit')
+    scrape_parser.add_argument('--full', action='store_true', help='With --once, run full crawls instead of incremental ones')
+    scrape_parser.add_argument('--source', action='append', help='Only crawl this source (repeatable)')
+    scrape_parser.set_defaults(handler=scrape)
+
+    # Options are parsed by classifier.main, which defines them
+    backfill_parser = commands.add_parser(
+        'backfill', add_help=False, help='Reclassify the job_type of every stored job (see classifier.py)'
+    )
+    backfill_parser.set_defaults(handler=backfill)
+
+    stats_parser = commands.add_parser('stats', help='Print job counts and the top facet values')
+    stats_parser.add_argument('--top', type=int, default=5, help='Values to show per facet')
+    stats_parser.set_defaults(handler=stats)
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'backfill':
+        args.backfill_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command == 'scrape' and args.full and not args.once:
+        parser.error("--full only applies with --once; the scheduler runs full crawls every full_interval minutes")
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import os
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# ---------- LOAD ENV ----------
+load_dotenv()
+
+POSTGRES_USER = os.getenv("POSTGRES_USER")
+POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
+DB_NAME = os.getenv("POSTGRES_DB")
+POSTGRES_HOST = os.getenv("POSTGRES_HOST")
+PORT = os.getenv("POSTGRES_PORT")
+
+# Use DATABASE_URL from env if available, otherwise construct it
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{PORT}/{DB_NAME}"
+# Same database through asyncpg, for the async read API
+ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+POSTGRES_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{PORT}/postgres"
+
+# Connection pool, per process (each server worker and the scraper has its own)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a free connection
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"  # Test connections on checkout
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Seconds, -1 = never
+DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", 30000))  # Milliseconds, 0 = no limit
+SCRAPER_STATEMENT_TIMEOUT = int(os.getenv("SCRAPER_STATEMENT_TIMEOUT", 300000))  # Milliseconds, 0 = no limit
+
+# ---------- POOL ----------
+class PoolStats:
+    """Counters for connection checkouts, including how long each one
+    waited for a free connection."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.lock = threading.Lock()
+
+    def record_wait(self, seconds):
+        with self.lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self):
+        with self.lock:
+            self.timeouts += 1
+
+    def as_dict(self):
+        return {
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'wait_ms_total': round(self.wait_total * 1000, 3),
+            'wait_ms_avg': round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0,
+            'wait_ms_max': round(self.wait_max * 1000, 3)
+        }
+
+class InstrumentedPoolMixin:
+    """Times every checkout. The time includes opening a new connection when
+    the pool grows, which is part of the wait a request sees."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout()
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - start)
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def engine_options(statement_timeout=DB_STATEMENT_TIMEOUT):
+    """Keyword arguments for create_engine (or SQLALCHEMY_ENGINE_OPTIONS)."""
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+        'pool_recycle': DB_POOL_RECYCLE,
+    }
+    if statement_timeout:
+        # Set per connection by libpq, so it also covers raw driver queries
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+def make_engine(statement_timeout=DB_STATEMENT_TIMEOUT):
+    return create_engine(DATABASE_URL, **engine_options(statement_timeout))
+
+def async_engine_options(statement_timeout=DB_STATEMENT_TIMEOUT):
+    """Keyword arguments for create_async_engine with the same pool settings."""
+    options = dict(engine_options(0), poolclass=InstrumentedAsyncQueuePool)
+    if statement_timeout:
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(statement_timeout)}}
+    return options
+
+def pool_stats(engine):
+    pool = engine.pool
+    stats = {
+        'pid': os.getpid(),
+        'size': pool.size(),
+        'max_overflow': DB_MAX_OVERFLOW,
+        'checked_out': pool.checkedout(),
+        'checked_in': pool.checkedin(),
+        # overflow() counts down from -size until the pool is full
+        'overflow': max(pool.overflow(), 0),
+    }
+    if isinstance(pool, InstrumentedPoolMixin):
+        stats.update(pool.stats.as_dict())
+    return stats
+
+# ---------- LOCKS ----------
+@contextmanager
+def advisory_lock(engine, name):
+    """Try to take the Postgres advisory lock `name` without waiting.
+
+    Yields whether it was acquired. The lock is held on a dedicated
+    connection until the block exits, so it is shared by every process
+    using the database and released if this one dies.
+    """
+    key = int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), 'big', signed=True)
+    with engine.connect() as conn:
+        acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {'key': key}).scalar()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': key})
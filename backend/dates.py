@@ -0,0 +1,59 @@
+import re
+from datetime import datetime, timedelta
+
+# "3d ago", "2 weeks ago", "5h", "1mo ago" ... relative to when the card was read
+RELATIVE_DATE = re.compile(r'^(\d+)\+?\s*([a-z]+?)s?(?:\s+ago)?$')
+RELATIVE_UNIT_DAYS = {
+    's': 0, 'sec': 0, 'm': 0, 'min': 0, 'minute': 0, 'h': 0, 'hr': 0, 'hour': 0,
+    'd': 1, 'day': 1, 'w': 7, 'wk': 7, 'week': 7,
+    'mo': 30, 'month': 30, 'y': 365, 'yr': 365, 'year': 365,
+}
+SAME_DAY = ('today', 'just now', 'new', 'just posted')
+
+ABSOLUTE_DATE_FORMATS = ('%Y-%m-%d', '%b %d, %Y', '%B %d, %Y', '%d %b %Y', '%d %B %Y', '%m/%d/%Y')
+# Dates without a year are in the past year relative to now
+YEARLESS_DATE_FORMATS = ('%b %d', '%B %d', '%d %b', '%d %B')
+
+def parse_posted_date(value, now):
+    """Turn the posted-on text of a job card into a date.
+
+    Understands relative text ("Today", "Yesterday", "3d ago", "2 weeks
+    ago"), which is resolved against `now`, and absolute dates such as
+    "2025-04-16" or "Apr 16, 2025". Returns None when the text is empty or
+    not recognised.
+    """
+    text = (value or '').strip().lower()
+    if not text:
+        return None
+    today = now.date()
+    if text in SAME_DAY:
+        return today
+    if text == 'yesterday':
+        return today - timedelta(days=1)
+
+    match = RELATIVE_DATE.match(text)
+    if match and match.group(2) in RELATIVE_UNIT_DAYS:
+        try:
+            return today - timedelta(days=int(match.group(1)) * RELATIVE_UNIT_DAYS[match.group(2)])
+        except OverflowError:
+            return None
+
+    text = text.title()
+    for date_format in ABSOLUTE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            pass
+    for date_format in YEARLESS_DATE_FORMATS:
+        try:
+            # Parse with the year included so Feb 29 is accepted in leap years
+            posted = datetime.strptime(f"{text} {today.year}", f"{date_format} %Y").date()
+        except ValueError:
+            continue
+        if posted <= today:
+            return posted
+        try:
+            return posted.replace(year=today.year - 1)
+        except ValueError:  # Feb 29 of a leap year still ahead
+            return None
+    return None
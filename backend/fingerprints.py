@@ -0,0 +1,90 @@
+import sys
+import logging
+import hashlib
+import threading
+from array import array
+from bisect import bisect_left
+from sqlalchemy import select
+from models import Job
+
+# Recently added fingerprints are merged into the sorted array once the
+# overflow set grows past this size
+MERGE_THRESHOLD = 4096
+
+def normalize(value):
+    return " ".join((value or "").lower().split())
+
+def fingerprint(title, company, link):
+    key = "\x1f".join((normalize(title), normalize(company), normalize(link).rstrip("/")))
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+def job_fingerprint(job):
+    return fingerprint(job['title'], job['company'], job['link'])
+
+def page_digest(jobs):
+    """Digest of a listing page's cards in page order, to tell whether the page changed."""
+    digest = hashlib.blake2b(digest_size=8)
+    for job in jobs:
+        digest.update(job_fingerprint(job).to_bytes(8, 'big'))
+    return digest.hexdigest()
+
+class FingerprintIndex:
+    """Compact in-memory set of 64-bit job fingerprints.
+
+    Loaded fingerprints live in a sorted unsigned 64-bit array (8 bytes per
+    job) searched with bisect; fingerprints added since the last merge sit
+    in a small set. A hit means the card was already stored, a miss means
+    it is probably new and still has to be checked by the database.
+    Writes are locked since sources can be crawled concurrently.
+    """
+
+    def __init__(self):
+        self.hashes = array('Q')
+        self.recent = set()
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.hashes) + len(self.recent)
+
+    def __contains__(self, value):
+        if value in self.recent:
+            return True
+        i = bisect_left(self.hashes, value)
+        return i < len(self.hashes) and self.hashes[i] == value
+
+    def add(self, value):
+        with self.lock:
+            if value in self:
+                return
+            self.recent.add(value)
+            if len(self.recent) >= MERGE_THRESHOLD:
+                self.merge()
+
+    def merge(self):
+        # Callers hold the lock; readers keep using the old array until the swap
+        hashes = array('Q', sorted(set(self.hashes).union(self.recent)))
+        self.hashes, self.recent = hashes, set()
+
+    def load(self, session):
+        rows = session.execute(
+            select(Job.title, Job.company, Job.link).execution_options(yield_per=10000)
+        )
+        hashes = array('Q', sorted({fingerprint(*row) for row in rows}))
+        with self.lock:
+            self.hashes, self.recent = hashes, set()
+            self.loaded = True
+        logging.info(f"Loaded fingerprint index: {self.describe()}")
+
+    def memory_bytes(self):
+        return self.hashes.itemsize * len(self.hashes) + sys.getsizeof(self.recent)
+
+    def false_positive_rate(self):
+        # Chance that an unseen card collides with one of the stored hashes
+        return len(self) / 2 ** 64
+
+    def describe(self):
+        return (
+            f"{len(self)} fingerprints, {round(self.memory_bytes() / 1024, 1)} KiB, "
+            f"false-positive rate {self.false_positive_rate():.2e}"
+        )
@@ -0,0 +1,43 @@
+"""Gunicorn settings for serving the API, overridable through env vars.
+
+Every worker process has its own connection pool, so the database sees up
+to GUNICORN_WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections. Keep
+GUNICORN_THREADS at or below DB_POOL_SIZE + DB_MAX_OVERFLOW so threads
+do not queue for connections.
+"""
+import os
+import multiprocessing
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))  # Seconds, above DB_STATEMENT_TIMEOUT
+graceful_timeout = 30
+keepalive = 5
+
+# Restart workers now and then to bound memory growth
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+# Prometheus multiprocess mode: workers write samples to PROMETHEUS_MULTIPROC_DIR
+# and /metrics aggregates them. Stale files from an earlier run are removed.
+def on_starting(server):
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.endswith(".db"):
+                os.remove(os.path.join(path, name))
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,169 @@
+import json
+import codecs
+import logging
+from sqlalchemy.dialects.postgresql import insert
+from models import Job
+from dates import parse_posted_date
+from classifier import classify_job_type
+
+# Unique key used to dedupe jobs on insert (see migration a3f1c2d4b5e6)
+JOB_UNIQUE_CONSTRAINT = 'uq_jobs_title_company'
+
+# Optional text fields accepted from API clients, with their defaults
+OPTIONAL_JOB_FIELDS = ('location', 'job_type', 'tags', 'date_posted', 'link', 'logo')
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# ---------- BATCH INSERT ----------
+def insert_job_rows(session, rows):
+    """Insert job dicts with a single multi-row INSERT without committing.
+
+    Rows that collide with an existing (title, company) are skipped by
+    ON CONFLICT DO NOTHING. Returns (id, title, company) for each row that
+    was actually inserted.
+    """
+    if not rows:
+        return []
+
+    table = Job.__table__
+    stmt = (
+        insert(table)
+        .values(rows)
+        .on_conflict_do_nothing(constraint=JOB_UNIQUE_CONSTRAINT)
+        .returning(table.c.id, table.c.title, table.c.company)
+    )
+    return session.execute(stmt).all()
+
+def insert_jobs(session, rows):
+    """Insert and commit a batch of job dicts. Returns (inserted, skipped)."""
+    if not rows:
+        return 0, 0
+
+    inserted = len(insert_job_rows(session, rows))
+    session.commit()
+
+    skipped = len(rows) - inserted
+    logging.info(f"Batch insert: {inserted} inserted, {skipped} skipped.")
+    return inserted, skipped
+
+# ---------- VALIDATION ----------
+def validate_job_row(data, now):
+    """Turn a client-supplied job object into an insertable row.
+
+    Raises ValueError describing the first problem found.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Expected a JSON object')
+
+    row = {}
+    for field in ('title', 'company'):
+        value = data.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"'{field}' is required")
+        row[field] = value
+
+    for field in OPTIONAL_JOB_FIELDS:
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"'{field}' must be a string")
+        row[field] = value or ''
+
+    # A job_type sent by the client is kept, also by later backfills; only missing ones are classified
+    row['job_type_from_client'] = bool(row['job_type'])
+    row['job_type'] = row['job_type'] or classify_job_type(row['title'], row['location'])
+    row['posted_on'] = parse_posted_date(row['date_posted'], now) or now.date()
+    row['date_posted'] = row['date_posted'] or now.strftime('%Y-%m-%d')
+    row['created_at'] = now
+    return row
+
+# ---------- STREAM PARSING ----------
+def iter_json_rows(stream):
+    """Yield (value, error) pairs from a request body without buffering it.
+
+    The body may be NDJSON (one object per line) or a single JSON array of
+    objects; the format is picked from its first non-blank character. A
+    row that fails to parse yields (None, message); for NDJSON parsing
+    then continues with the next line, for arrays it stops.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(lambda: stream.read(READ_CHUNK_SIZE), b'')
+    buffer = ''
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        if buffer.strip():
+            break
+    buffer = buffer.lstrip()
+
+    if buffer.startswith('['):
+        yield from _iter_json_array(buffer[1:], chunks, decoder)
+    else:
+        yield from _iter_ndjson(buffer, chunks, decoder)
+
+def _iter_ndjson(buffer, chunks, decoder):
+    while True:
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            if line.strip():
+                yield _parse_json(line)
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        buffer += decoder.decode(chunk)
+
+    buffer += decoder.decode(b'', final=True)
+    if buffer.strip():
+        yield _parse_json(buffer)
+
+def _parse_json(text):
+    try:
+        return json.loads(text), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+def _iter_json_array(buffer, chunks, decoder):
+    json_decoder = json.JSONDecoder()
+    whitespace = json.decoder.WHITESPACE
+    exhausted = False
+    expect_value = True
+    pos = 0
+
+    while True:
+        pos = whitespace.match(buffer, pos).end()
+        if pos < len(buffer):
+            if buffer[pos] == ']':
+                return
+            if not expect_value:
+                if buffer[pos] != ',':
+                    yield None, "Invalid JSON: expected ',' or ']'"
+                    return
+                pos += 1
+                expect_value = True
+                continue
+
+            try:
+                value, end = json_decoder.raw_decode(buffer, pos)
+            except ValueError as e:
+                # The value may just be cut off at the end of the chunk
+                if exhausted:
+                    yield None, f"Invalid JSON: {e}"
+                    return
+            else:
+                if end < len(buffer) or exhausted:
+                    yield value, None
+                    pos = end
+                    expect_value = False
+                    continue
+
+        if exhausted:
+            yield None, "Invalid JSON: unterminated array"
+            return
+
+        buffer = buffer[pos:]
+        pos = 0
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer += decoder.decode(b'', final=True)
+        else:
+            buffer += decoder.decode(chunk)
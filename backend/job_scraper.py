@@ -1,34 +1,48 @@
 import time
+import queue
 import logging
-import schedule
-import psycopg2
+import json
+import signal
+import threading
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from models import Base, Job
+from models import Base
+from ingest import insert_jobs
+from fingerprints import FingerprintIndex, job_fingerprint
+from cache import create_cache
+from metrics import (
+    PAGE_LOAD_SECONDS, PAGE_PARSE_SECONDS, DB_WRITE_SECONDS, DB_SECONDS_PER_CARD, CARDS, INDEX_HITS,
+    JOBS_INSERTED, JOBS_SKIPPED, PAGE_RETRIES, ENGINE_RESTARTS, observe_crawl, start_scraper_exporter
+)
+from database import DB_NAME, POSTGRES_URL, SCRAPER_STATEMENT_TIMEOUT, make_engine, advisory_lock
+from dates import parse_posted_date
+from classifier import classify_job_type
+from changes import JOB_CHANGES_RETENTION_DAYS, prune_job_changes
+from checkpoints import CrawlProgress
 from datetime import datetime
 
 # ---------- LOAD ENV ----------
 load_dotenv()
 
-POSTGRES_USER = os.getenv("POSTGRES_USER")
-POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-DB_NAME = os.getenv("POSTGRES_DB")
-POSTGRES_HOST = os.getenv("POSTGRES_HOST")
-PORT = os.getenv("POSTGRES_PORT")
 TARGET_URL = os.getenv("TARGET_URL")
 SCRAPE_INTERVAL = int(os.getenv("SCRAPE_INTERVAL", 3))  # Default to 3 minutes if not set
 RATE_LIMIT_DELAY = int(os.getenv("RATE_LIMIT_DELAY", 2))  # Default to 2 seconds if not set
-
-# Use DATABASE_URL from env if available, otherwise construct it
-DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{PORT}/{DB_NAME}"
-POSTGRES_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{PORT}/postgres"
+FULL_CRAWL_INTERVAL = int(os.getenv("FULL_CRAWL_INTERVAL", 60))  # Minutes between full re-crawls
+SCRAPE_STOP_AFTER_KNOWN_PAGES = int(os.getenv("SCRAPE_STOP_AFTER_KNOWN_PAGES", 2))  # Stop after K pages with no new jobs, 0 = always crawl everything
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", 1))  # Parallel browsers, 1 keeps the sequential crawl
+SCRAPE_RPS = float(os.getenv("SCRAPE_RPS", 1 / RATE_LIMIT_DELAY if RATE_LIMIT_DELAY else 0))  # Page loads per second across all workers, 0 = unlimited
+SCRAPE_ENGINE = os.getenv("SCRAPE_ENGINE", "selenium")  # selenium or http
+SELENIUM_EXTRACT_MODE = os.getenv("SELENIUM_EXTRACT_MODE", "script")  # script (one execute_script per page) or elements
+HTTP_USER_AGENT = os.getenv("HTTP_USER_AGENT", "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+PAGE_URL_TEMPLATE = os.getenv("PAGE_URL_TEMPLATE", "{base}?page={page}")
+EMPTY_RESULTS_TEXT = os.getenv("EMPTY_RESULTS_TEXT", "No jobs found")  # Shown in place of cards past the end of the listing
+SCRAPE_BATCH_SIZE = int(os.getenv("SCRAPE_BATCH_SIZE", 0))  # 0 writes one batch per page
+SCRAPE_SOURCES = os.getenv("SCRAPE_SOURCES")  # JSON list of sources, defaults to TARGET_URL alone
+SCRAPE_ENGINE_RECYCLE = int(os.getenv("SCRAPE_ENGINE_RECYCLE", 50))  # Restart warm engines every N crawls, 0 = never
+SCRAPE_PAGE_RETRIES = int(os.getenv("SCRAPE_PAGE_RETRIES", 3))  # Retries of a failed page load before the crawl fails
+SCRAPE_RETRY_BACKOFF = float(os.getenv("SCRAPE_RETRY_BACKOFF", 5))  # Seconds before the first retry, doubled for each further one
 
 # ---------- LOGGING ----------
 logging.basicConfig(
@@ -39,6 +53,8 @@ logging.basicConfig(
 
 # ---------- CREATE DATABASE ----------
 def create_database():
+    import psycopg2
+
     try:
         conn = psycopg2.connect(POSTGRES_URL)
         conn.autocommit = True
@@ -58,127 +74,846 @@ def create_database():
         logging.error(f"Error creating DB: {e}")
 
 def create_tables():
-    engine = create_engine(DATABASE_URL)
+    # Full crawls load every fingerprint, so the scraper gets its own statement timeout
+    engine = make_engine(SCRAPER_STATEMENT_TIMEOUT)
+    with engine.begin() as conn:
+        # The trigram indexes on jobs need pg_trgm
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
     Base.metadata.create_all(engine)
     return engine
 
-# ---------- SCRAPE JOBS ----------
-def scrape_jobs():
-    logging.info("Starting job scrape...")
-    start_time = time.time()
-    session = Session()
+# Bound to the scraper's engine by init_database()
+Session = sessionmaker()
+
+def init_database():
+    """Create the database and tables if needed and bind Session to them."""
+    create_database()
+    Session.configure(bind=create_tables())
+
+# ---------- RATE LIMITING ----------
+class RateLimiter:
+    """Token bucket shared by every scrape worker.
+
+    Tokens refill at `rate` per second up to `capacity`; `acquire` blocks
+    until a token is available. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# ---------- PAGE QUEUE ----------
+class PageQueue:
+    """Hands out page numbers to workers until the last page is known."""
+
+    def __init__(self, first_page=1):
+        self.next_page = first_page
+        self.last_page = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        with self.lock:
+            if self.last_page is not None and self.next_page > self.last_page:
+                return None
+            page_number = self.next_page
+            self.next_page += 1
+            return page_number
+
+    def mark_last(self, page_number):
+        with self.lock:
+            if self.last_page is None or page_number < self.last_page:
+                self.last_page = page_number
+
+    def stop(self):
+        """Hand out no further pages."""
+        with self.lock:
+            self.last_page = self.next_page - 1
+
+# ---------- SCRAPE ENGINES ----------
+CARD_CLASS = "Job_job-card__YgDAV"
+TITLE_CLASS = "Job_job-card__position__ic1rc"
+COMPANY_CLASS = "Job_job-card__company__7T9qY"
+LOCATION_CLASS = "Job_job-card__location__bq7jX"
+TAG_CLASS = "Job_job-card__tag__YgDAV"
+POSTED_ON_CLASS = "Job_job-card__posted-on__NCZaJ"
+LINK_CLASS = "Job_job-page-link__a5I5g"
+NEXT_BUTTON_XPATH = "//button[normalize-space(text())='Next']"
+EMPTY_RESULTS_XPATH = f"//*[contains(normalize-space(text()), '{EMPTY_RESULTS_TEXT}')]"
+
+CARD_FIELD_CLASSES = {
+    'card': CARD_CLASS,
+    'title': TITLE_CLASS,
+    'company': COMPANY_CLASS,
+    'location': LOCATION_CLASS,
+    'tag': TAG_CLASS,
+    'posted_on': POSTED_ON_CLASS,
+    'link': LINK_CLASS,
+}
+
+# Resolves every card field in the browser and returns them as one JSON array.
+# Cards missing a required element are dropped, like the per-element path does;
+# cards without a logo are kept with a null one, like parse_listing_html does.
+EXTRACT_CARDS_SCRIPT = """
+const classes = arguments[0];
+const text = (el) => el.innerText.trim();
+const cards = [];
+for (const card of document.getElementsByClassName(classes.card)) {
+    const one = (cls) => card.getElementsByClassName(cls)[0];
+    const all = (cls) => Array.from(card.getElementsByClassName(cls), text);
+    const title = one(classes.title);
+    const company = one(classes.company);
+    const postedOn = one(classes.posted_on);
+    const link = one(classes.link);
+    const img = card.getElementsByTagName('img')[0];
+    if (!title || !company || !postedOn || !link) {
+        continue;
+    }
+    cards.push({
+        title: text(title),
+        company: text(company),
+        locations: all(classes.location),
+        tags: all(classes.tag),
+        date_posted: text(postedOn),
+        link: link.href,
+        logo_img: img ? img.src : null
+    });
+}
+return cards;
+"""
+
+def page_url(base_url, page_number):
+    if page_number == 1:
+        return base_url
+    return PAGE_URL_TEMPLATE.format(base=base_url, page=page_number)
+
+def listing_page(jobs, next_enabled, empty_results):
+    """(jobs, is_last_page) for a loaded listing page.
+
+    `next_enabled` is None when the page has no Next button. A page with
+    cards is the last one unless Next is enabled. A page without cards only
+    ends the listing when it says so, with the empty-results marker or a
+    disabled Next button; a blocked or half-rendered page raises instead,
+    so it is retried with backoff like any other failed load.
+    """
+    if jobs:
+        return jobs, not next_enabled
+    if empty_results or next_enabled is False:
+        return [], True
+    raise ValueError("no job cards and no end-of-listing marker on the page")
+
+def build_job(title, company, locations, tags, date_posted, link, logo_img):
+    full_link = f"https://www.actuarylist.com{link}" if link.startswith("/") else link
+    location = ", ".join(locations)
+    now = datetime.utcnow()
+
+    return {
+        'title': title,
+        'company': company,
+        'location': location,
+        'job_type': classify_job_type(title, location),
+        'tags': ", ".join(tag for tag in tags if tag),
+        'date_posted': date_posted,
+        'posted_on': parse_posted_date(date_posted, now) or now.date(),
+        'link': full_link,
+        'logo': logo_img,
+        'created_at': now
+    }
+
+class ScrapeEngine:
+    """Fetches one listing page at a time.
+
+    `fetch_page` returns the parsed job dicts for a page of `base_url` and
+    whether it is the last one. Engines stay open across crawls (see
+    Source.get_engines); `reset` is called before each crawl.
+    """
+
+    name = None
+
+    def __init__(self, base_url=TARGET_URL):
+        self.base_url = base_url
+
+    def open(self):
+        pass
+
+    def is_open(self):
+        return True
+
+    def is_alive(self):
+        """Whether the engine can still load pages; checked after a failed load."""
+        return self.is_open()
+
+    def reset(self):
+        pass
+
+    def restart(self):
+        self.close()
+        self.open()
+        self.reset()
+
+    def fetch_page(self, page_number):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SeleniumEngine(ScrapeEngine):
+    """Drives headless Chrome, following the "Next" button when it can.
+
+    Selenium is imported by the methods that use it, so processes that
+    never open a browser do not pay for importing it.
+    """
+
+    name = 'selenium'
+
+    def __init__(self, base_url=TARGET_URL):
+        super().__init__(base_url)
+        self.driver = None
+        self.page_number = 0
+
+    def open(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
 
-    try:
         options = Options()
         options.add_argument('--headless')
-        driver = webdriver.Chrome(options=options)
-        driver.get(TARGET_URL)
+        self.driver = webdriver.Chrome(options=options)
 
-        total_jobs_scraped = 0
-        page_number = 1
+    def is_open(self):
+        return self.driver is not None
 
-        while True:
-            logging.info(f"Scraping page {page_number}...")
-
-            wait = WebDriverWait(driver, 15)
-            wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, "Job_job-card__YgDAV")))
-
-            job_cards = driver.find_elements(By.CLASS_NAME, "Job_job-card__YgDAV")
-            logging.info(f"Found {len(job_cards)} job cards on page {page_number}.")
-
-            count = 0
-            for card in job_cards:
-                try:
-                    title = card.find_element(By.CLASS_NAME, "Job_job-card__position__ic1rc").text
-                    company = card.find_element(By.CLASS_NAME, "Job_job-card__company__7T9qY").text
-                    location_links = card.find_elements(By.CLASS_NAME, "Job_job-card__location__bq7jX")
-                    locations = ", ".join([loc.text for loc in location_links])
-
-                    # Fix tags scraping
-                    tag_elements = card.find_elements(By.CLASS_NAME, "Job_job-card__tag__YgDAV")
-                    tags = ", ".join([tag.text.strip() for tag in tag_elements if tag.text.strip()])
-
-                    date_posted = card.find_element(By.CLASS_NAME, "Job_job-card__posted-on__NCZaJ").text
-                    link = card.find_element(By.CLASS_NAME, "Job_job-page-link__a5I5g").get_attribute("href")
-                    logo_img = card.find_element(By.TAG_NAME, "img").get_attribute("src")
-
-                    full_link = f"https://www.actuarylist.com{link}" if link.startswith("/") else link
-
-                    existing = session.query(Job).filter_by(title=title, company=company).first()
-                    if existing:
-                        continue
-
-                    job = Job(
-                        title=title,
-                        company=company,
-                        location=locations,
-                        tags=tags,
-                        date_posted=date_posted,
-                        link=full_link,
-                        logo=logo_img,
-                        created_at=datetime.utcnow()
-                    )
-                    session.add(job)
-                    count += 1
-
-                    # Commit after each job to ensure data is saved
-                    session.commit()
-                    logging.info(f"Saved job: {title} at {company}")
-
-                except Exception as e:
-                    logging.error(f"Error parsing job card: {e}")
-                    continue
-
-            total_jobs_scraped += count
-            logging.info(f"Scraped {count} new jobs from page {page_number}.")
-
-            # Try to find and click the Next button
+    def is_alive(self):
+        # A crashed Chrome or a lost session fails every command
+        if self.driver is None:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def reset(self):
+        # The browser may still show a later page from the previous crawl
+        self.page_number = 0
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logging.warning(f"Error closing browser: {e}")
+            self.driver = None
+
+    def fetch_page(self, page_number):
+        from selenium.common.exceptions import TimeoutException
+
+        with PAGE_LOAD_SECONDS.labels(self.name).time():
+            if self.page_number and page_number == self.page_number + 1:
+                self.click_next()
+            else:
+                self.driver.get(page_url(self.base_url, page_number))
+            self.page_number = page_number
+
+            try:
+                self.wait_for_cards()
+            except TimeoutException:
+                # Raises unless the page marks the end of the listing
+                return listing_page([], self.next_enabled(), self.has_empty_results())
+
+        with PAGE_PARSE_SECONDS.labels(self.name).time():
+            jobs = self.scrape_page(page_number)
+            return listing_page(jobs, self.next_enabled(), not jobs and self.has_empty_results())
+
+    def click_next(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        first_card = self.driver.find_element(By.CLASS_NAME, CARD_CLASS)
+        self.driver.find_element(By.XPATH, NEXT_BUTTON_XPATH).click()
+
+        # Wait for the previous page's cards to be replaced
+        try:
+            WebDriverWait(self.driver, RATE_LIMIT_DELAY or 2).until(EC.staleness_of(first_card))
+        except TimeoutException:
+            pass
+
+    def wait_for_cards(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        wait = WebDriverWait(self.driver, 15)
+        wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, CARD_CLASS)))
+
+    def scrape_page(self, page_number):
+        jobs = None
+        if SELENIUM_EXTRACT_MODE == 'script':
             try:
-                # Find the Next button using XPath that looks for a button with text "Next"
-                next_button = driver.find_element(By.XPATH, "//button[text()='Next']")
+                jobs = self.extract_cards_script()
+            except Exception as e:
+                logging.warning(f"Script extraction failed on page {page_number}, falling back to per-element parsing: {e}")
+
+        if jobs is None:
+            jobs = self.extract_cards_elements()
 
-                # Check if the button is disabled
-                if next_button.get_attribute("disabled"):
-                    logging.info("Reached the last page. No more jobs to scrape.")
-                    break
+        logging.info(f"Found {len(jobs)} job cards on page {page_number}.")
+        return jobs
 
-                # Click the Next button
-                next_button.click()
-                page_number += 1
+    def extract_cards_script(self):
+        # One round trip for the whole page instead of ~8 per card
+        cards = self.driver.execute_script(EXTRACT_CARDS_SCRIPT, CARD_FIELD_CLASSES)
+        if not isinstance(cards, list):
+            raise ValueError(f"unexpected script result {type(cards).__name__}")
+        return [build_job(**card) for card in cards]
 
-                # Wait for the page to load
-                time.sleep(RATE_LIMIT_DELAY)
+    def extract_cards_elements(self):
+        from selenium.webdriver.common.by import By
 
+        jobs = []
+        for card in self.driver.find_elements(By.CLASS_NAME, CARD_CLASS):
+            try:
+                jobs.append(self.parse_card(card))
             except Exception as e:
-                logging.info(f"No more pages to scrape: {e}")
+                logging.error(f"Error parsing job card: {e}")
+                continue
+        return jobs
+
+    def parse_card(self, card):
+        from selenium.webdriver.common.by import By
+
+        images = card.find_elements(By.TAG_NAME, "img")
+        return build_job(
+            title=card.find_element(By.CLASS_NAME, TITLE_CLASS).text,
+            company=card.find_element(By.CLASS_NAME, COMPANY_CLASS).text,
+            locations=[loc.text for loc in card.find_elements(By.CLASS_NAME, LOCATION_CLASS)],
+            tags=[tag.text.strip() for tag in card.find_elements(By.CLASS_NAME, TAG_CLASS)],
+            date_posted=card.find_element(By.CLASS_NAME, POSTED_ON_CLASS).text,
+            link=card.find_element(By.CLASS_NAME, LINK_CLASS).get_attribute("href"),
+            logo_img=images[0].get_attribute("src") if images else None
+        )
+
+    def next_enabled(self):
+        """Whether the Next button is enabled, None when there is none."""
+        from selenium.webdriver.common.by import By
+
+        next_buttons = self.driver.find_elements(By.XPATH, NEXT_BUTTON_XPATH)
+        if not next_buttons:
+            return None
+        return not next_buttons[0].get_attribute("disabled")
+
+    def has_empty_results(self):
+        from selenium.webdriver.common.by import By
+
+        return bool(self.driver.find_elements(By.XPATH, EMPTY_RESULTS_XPATH))
+
+def class_xpath(class_name):
+    return f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+class HttpEngine(ScrapeEngine):
+    """Fetches server-rendered HTML over a pooled HTTP session and parses
+    every card on the page in a single lxml pass, without a browser."""
+
+    name = 'http'
+
+    def __init__(self, base_url=TARGET_URL):
+        super().__init__(base_url)
+        self.session = None
+
+    def open(self):
+        import requests
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = HTTP_USER_AGENT
+
+    def is_open(self):
+        return self.session is not None
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def fetch_page(self, page_number):
+        with PAGE_LOAD_SECONDS.labels(self.name).time():
+            response = self.session.get(page_url(self.base_url, page_number), timeout=15)
+            # Pages past the end of the listing are not found
+            if response.status_code == 404 and page_number > 1:
+                return [], True
+            response.raise_for_status()
+            html = response.text
+
+        with PAGE_PARSE_SECONDS.labels(self.name).time():
+            jobs, last_page = parse_listing_html(html)
+        logging.info(f"Found {len(jobs)} job cards on page {page_number}.")
+        return jobs, last_page
+
+def parse_listing_html(html):
+    """Parse a listing page into job dicts. Returns (jobs, is_last_page), see listing_page."""
+    import lxml.html
+
+    tree = lxml.html.fromstring(html)
+
+    jobs = []
+    for card in tree.xpath(class_xpath(CARD_CLASS)):
+        try:
+            links = card.xpath(class_xpath(LINK_CLASS))
+            images = card.xpath('.//img')
+            jobs.append(build_job(
+                title=card.xpath(class_xpath(TITLE_CLASS))[0].text_content().strip(),
+                company=card.xpath(class_xpath(COMPANY_CLASS))[0].text_content().strip(),
+                locations=[loc.text_content().strip() for loc in card.xpath(class_xpath(LOCATION_CLASS))],
+                tags=[tag.text_content().strip() for tag in card.xpath(class_xpath(TAG_CLASS))],
+                date_posted=card.xpath(class_xpath(POSTED_ON_CLASS))[0].text_content().strip(),
+                link=links[0].get('href', ''),
+                logo_img=images[0].get('src') if images else None
+            ))
+        except Exception as e:
+            logging.error(f"Error parsing job card: {e}")
+            continue
+
+    next_buttons = tree.xpath(NEXT_BUTTON_XPATH)
+    next_enabled = next_buttons[0].get('disabled') is None if next_buttons else None
+    return listing_page(jobs, next_enabled, not jobs and bool(tree.xpath(EMPTY_RESULTS_XPATH)))
+
+SCRAPE_ENGINES = {engine.name: engine for engine in (SeleniumEngine, HttpEngine)}
+
+def make_scrape_engine(base_url=TARGET_URL):
+    try:
+        engine = SCRAPE_ENGINES[SCRAPE_ENGINE](base_url)
+    except KeyError:
+        raise ValueError(f"Unknown SCRAPE_ENGINE '{SCRAPE_ENGINE}', expected one of {sorted(SCRAPE_ENGINES)}")
+    engine.open()
+    return engine
+
+# ---------- SOURCES ----------
+class Source:
+    """A listing site crawled on its own schedule.
+
+    Its scrape engines (browsers or HTTP sessions) are kept open between
+    crawls so a cycle does not pay for a cold Chrome start; they are
+    restarted every SCRAPE_ENGINE_RECYCLE crawls and after a failure.
+    """
+
+    def __init__(self, name, url, interval=SCRAPE_INTERVAL, full_interval=FULL_CRAWL_INTERVAL):
+        self.name = name
+        self.url = url
+        self.interval = interval  # Minutes between incremental crawls
+        self.full_interval = full_interval  # Minutes between full crawls
+        self.engines = []
+        self.crawls = 0
+
+    def get_engines(self, count):
+        if SCRAPE_ENGINE_RECYCLE and self.crawls and self.crawls % SCRAPE_ENGINE_RECYCLE == 0:
+            logging.info(f"Recycling {self.name} engines after {self.crawls} crawls.")
+            self.close_engines()
+        self.crawls += 1
+
+        while len(self.engines) < count:
+            self.engines.append(make_scrape_engine(self.url))
+        for engine in self.engines[:count]:
+            if not engine.is_open():
+                engine.open()
+            engine.reset()
+        return self.engines[:count]
+
+    def close_engines(self):
+        for engine in self.engines:
+            engine.close()
+        self.engines = []
+
+def load_sources():
+    """Sources from SCRAPE_SOURCES, e.g.
+    [{"name": "actuarylist", "url": "https://www.actuarylist.com/", "interval": 3, "full_interval": 60}],
+    or TARGET_URL alone. Intervals are in minutes and default to SCRAPE_INTERVAL and FULL_CRAWL_INTERVAL.
+    """
+    if not SCRAPE_SOURCES:
+        return [Source('default', TARGET_URL)]
+    return [Source(**source) for source in json.loads(SCRAPE_SOURCES)]
+
+# ---------- DEDUP ----------
+# Fingerprints of every stored job, kept in memory across scheduler runs
+fingerprint_index = FingerprintIndex()
+
+# Bumps the API response cache version after new jobs land (shared backends only)
+job_cache = create_cache()
+
+class CrawlStats:
+    def __init__(self):
+        self.cards = 0
+        self.index_hits = 0
+        self.inserted = 0
+        self.skipped = 0
+
+    def hit_ratio(self):
+        return self.index_hits / self.cards if self.cards else 0
+
+    def summary(self):
+        return (
+            f"{self.cards} cards, {self.index_hits} rejected by fingerprint index "
+            f"(hit ratio {round(self.hit_ratio(), 3)}), {self.inserted} inserted, "
+            f"{self.skipped} probable-new already in the database"
+        )
+
+def filter_new_jobs(jobs, stats):
+    """Drop cards whose fingerprint is already indexed, without a DB hit."""
+    new_jobs = []
+    page_fingerprints = set()
+    for job in jobs:
+        value = job_fingerprint(job)
+        if value in fingerprint_index or value in page_fingerprints:
+            continue
+        page_fingerprints.add(value)
+        new_jobs.append(job)
+
+    stats.cards += len(jobs)
+    stats.index_hits += len(jobs) - len(new_jobs)
+    CARDS.inc(len(jobs))
+    INDEX_HITS.inc(len(jobs) - len(new_jobs))
+    return new_jobs
+
+def write_batch(session, jobs, stats):
+    start = time.perf_counter()
+    inserted, skipped = insert_jobs(session, jobs)
+    if jobs:
+        elapsed = time.perf_counter() - start
+        DB_WRITE_SECONDS.observe(elapsed)
+        DB_SECONDS_PER_CARD.observe(elapsed / len(jobs))
+    for job in jobs:
+        fingerprint_index.add(job_fingerprint(job))
+
+    if inserted:
+        job_cache.invalidate()
+
+    stats.inserted += inserted
+    stats.skipped += skipped
+    JOBS_INSERTED.inc(inserted)
+    JOBS_SKIPPED.inc(skipped)
+    return inserted
+
+def write_pages(session, jobs, stats, progress):
+    """Write a batch, then checkpoint the pages it completes."""
+    inserted = write_batch(session, jobs, stats)
+    progress.pages_written(session)
+    return inserted
+
+# ---------- INCREMENTAL CRAWL ----------
+class KnownPageTracker:
+    """Decides when an incremental crawl can stop.
+
+    Pages are recorded with their count of unseen jobs as they are parsed (possibly out of order when
+    workers run in parallel) and evaluated in page order. Once
+    `stop_after` consecutive pages contain no unseen jobs, `record`
+    returns the page number to stop at. A `stop_after` of 0 never stops.
+    """
+
+    def __init__(self, stop_after, first_page=1):
+        self.stop_after = stop_after
+        self.new_counts = {}
+        self.next_page = first_page
+        self.streak = 0
+
+    def record(self, page_number, new_jobs):
+        self.new_counts[page_number] = new_jobs
+
+        while self.next_page in self.new_counts:
+            self.streak = 0 if self.new_counts.pop(self.next_page) else self.streak + 1
+            if self.stop_after and self.streak >= self.stop_after:
+                return self.next_page
+            self.next_page += 1
+        return None
+
+# ---------- SCRAPE JOBS ----------
+# Set on shutdown; crawls stop at the next page boundary and flush what they have
+shutdown = threading.Event()
+
+def fetch_page_with_retry(engine, page_number):
+    """engine.fetch_page, retried SCRAPE_PAGE_RETRIES times with exponential backoff.
+
+    A crashed browser is restarted before the retry, so the crawl goes on
+    from the same page instead of failing. Raises the last error once the
+    retries are used up, or straight away on shutdown.
+    """
+    delay = SCRAPE_RETRY_BACKOFF
+    for attempt in range(SCRAPE_PAGE_RETRIES + 1):
+        try:
+            return engine.fetch_page(page_number)
+        except Exception as e:
+            if attempt == SCRAPE_PAGE_RETRIES:
+                raise
+            logging.warning(
+                f"Loading page {page_number} with {engine.name} failed ({e}), "
+                f"retry {attempt + 1}/{SCRAPE_PAGE_RETRIES} in {delay} seconds."
+            )
+            PAGE_RETRIES.labels(engine.name).inc()
+            if shutdown.wait(delay):
+                raise
+            delay *= 2
+
+            if not engine.is_alive():
+                logging.info(f"Restarting {engine.name} engine.")
+                ENGINE_RESTARTS.labels(engine.name).inc()
+                engine.restart()
+
+def scrape_jobs(source, full=False):
+    """Crawl `source` once. Raises when the crawl fails so the scheduler can back off."""
+    mode = "full" if full or not SCRAPE_STOP_AFTER_KNOWN_PAGES else "incremental"
+    session = Session()
+
+    try:
+        # Another scraper process may be crawling the same source
+        with advisory_lock(session.get_bind(), f"scrape:{source.name}") as acquired:
+            if not acquired:
+                logging.info(f"Skipping {mode} scrape of {source.name}: another process is crawling it.")
+                return
+            run_crawl(session, source, mode, full)
+    finally:
+        session.close()
+
+def run_crawl(session, source, mode, full):
+    logging.info(f"Starting {mode} job scrape of {source.name}...")
+    start_time = time.time()
+    stats = CrawlStats()
+
+    try:
+        # Only full crawls are checkpointed; an incremental crawl looks at the newest pages
+        progress = CrawlProgress.load(session, source.name) if full else CrawlProgress(source.name)
+        tracker = KnownPageTracker(0 if full else SCRAPE_STOP_AFTER_KNOWN_PAGES, progress.first_page)
+
+        # Full crawls resync the index with rows added or deleted elsewhere
+        if full or not fingerprint_index.loaded:
+            fingerprint_index.load(session)
+
+        engines = source.get_engines(max(SCRAPE_WORKERS, 1))
+        if SCRAPE_WORKERS > 1:
+            finished = scrape_jobs_parallel(session, engines, tracker, stats, progress)
+        else:
+            finished = scrape_jobs_sequential(session, engines[0], tracker, stats, progress)
+        # An interrupted crawl keeps its checkpoint and resumes next time
+        if finished:
+            progress.clear(session)
+        else:
+            logging.info(f"Crawl of {source.name} interrupted after page {progress.last_page}.")
+        elapsed = time.time() - start_time
+        observe_crawl(mode, stats, elapsed)
+        logging.info(f"Scraped {stats.inserted} new jobs from {source.name} in {round(elapsed, 2)} seconds.")
+        logging.info(f"Dedup: {stats.summary()}; index: {fingerprint_index.describe()}")
+
+    except Exception as e:
+        logging.error(f"Scraping {source.name} failed: {e}")
+        # The browser may be wedged; start fresh next time
+        source.close_engines()
+        session.rollback()
+        raise
+
+def scrape_jobs_sequential(session, engine, tracker, stats, progress):
+    """Returns whether the crawl finished, False when stopped by shutdown."""
+    limiter = RateLimiter(SCRAPE_RPS)
+    page_number = progress.first_page
+    pending = []
+
+    while not shutdown.is_set():
+        logging.info(f"Scraping page {page_number} with {engine.name}...")
+        limiter.acquire()
+        try:
+            jobs, last_page = fetch_page_with_retry(engine, page_number)
+        except Exception:
+            # Keep the pages parsed so far; the next crawl resumes after them
+            write_pages(session, pending, stats, progress)
+            raise
+        progress.parsed(page_number, jobs)
+        new_jobs = filter_new_jobs(jobs, stats)
+        pending.extend(new_jobs)
+        stop_page = tracker.record(page_number, len(new_jobs))
+
+        # Flush once per page, or whenever a full batch has been collected
+        if SCRAPE_BATCH_SIZE <= 0 or len(pending) >= SCRAPE_BATCH_SIZE:
+            inserted = write_pages(session, pending, stats, progress)
+            pending = []
+            logging.info(f"Scraped {inserted} new jobs up to page {page_number}.")
+
+        if last_page:
+            logging.info("Reached the last page. No more jobs to scrape.")
+            break
+        if stop_page:
+            logging.info(f"No new jobs on the last {tracker.stop_after} pages, stopping at page {stop_page}.")
+            break
+        page_number += 1
+
+    write_pages(session, pending, stats, progress)
+    return not shutdown.is_set()
+
+def scrape_worker(worker_id, engine, pages, results, limiter, errors):
+    start_time = time.time()
+    pages_scraped = 0
+    jobs_scraped = 0
+
+    try:
+        while not shutdown.is_set():
+            page_number = pages.get()
+            if page_number is None:
                 break
 
-        driver.quit()
-        logging.info(f"Scraped {total_jobs_scraped} new jobs in {round(time.time() - start_time, 2)} seconds.")
+            limiter.acquire()
+            jobs, last_page = fetch_page_with_retry(engine, page_number)
+            # Only a page that marks the end of the listing comes back empty
+            if not jobs:
+                pages.mark_last(page_number - 1)
+                break
+
+            results.put((page_number, jobs))
+            pages_scraped += 1
+            jobs_scraped += len(jobs)
+
+            if last_page:
+                pages.mark_last(page_number)
 
     except Exception as e:
-        logging.error(f"Scraping failed: {e}")
+        logging.error(f"Worker {worker_id} failed: {e}")
+        errors.append(e)
+        # Reopened on the next crawl
+        engine.close()
     finally:
-        session.close()
+        results.put(None)
+
+        elapsed = time.time() - start_time
+        logging.info(
+            f"Worker {worker_id}: {pages_scraped} pages, {jobs_scraped} cards in {round(elapsed, 2)} seconds "
+            f"({round(pages_scraped / elapsed, 2) if elapsed else 0} pages/s)."
+        )
+
+def scrape_jobs_parallel(session, engines, tracker, stats, progress):
+    """Returns whether the crawl finished, False when stopped by shutdown."""
+    logging.info(f"Scraping with {len(engines)} workers at {SCRAPE_RPS} requests/s...")
+    pages = PageQueue(progress.first_page)
+    results = queue.Queue()
+    limiter = RateLimiter(SCRAPE_RPS)
+    errors = []
+
+    workers = [
+        threading.Thread(target=scrape_worker, args=(i, engine, pages, results, limiter, errors), daemon=True)
+        for i, engine in enumerate(engines, start=1)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Single writer: drain parsed pages and insert them in batches
+    pending = []
+    running = len(workers)
+    try:
+        while running:
+            result = results.get()
+            if result is None:
+                running -= 1
+                continue
+
+            page_number, jobs = result
+            progress.parsed(page_number, jobs)
+            new_jobs = filter_new_jobs(jobs, stats)
+            pending.extend(new_jobs)
+
+            stop_page = tracker.record(page_number, len(new_jobs))
+            if stop_page:
+                logging.info(f"No new jobs on the last {tracker.stop_after} pages, stopping at page {stop_page}.")
+                pages.mark_last(stop_page)
+
+            if SCRAPE_BATCH_SIZE <= 0 or len(pending) >= SCRAPE_BATCH_SIZE:
+                write_pages(session, pending, stats, progress)
+                pending = []
+    finally:
+        # After a failed write too: fetch no more pages for this crawl, and let the
+        # workers finish the page they are on before run_crawl closes their engines
+        pages.stop()
+        for worker in workers:
+            worker.join()
+
+    write_pages(session, pending, stats, progress)
+
+    # A worker ran out of retries: the pages it owned are missing, so the
+    # crawl fails and the next one resumes after the last complete page
+    if errors:
+        raise errors[0]
+    return not shutdown.is_set()
 
 # ---------- SCHEDULER ----------
-def start_scheduler():
-    logging.info(f"Starting job scheduler (runs every {SCRAPE_INTERVAL} minutes)...")
-    schedule.every(SCRAPE_INTERVAL).minutes.do(scrape_jobs)
-    scrape_jobs()  # run immediately on startup
+def prune_changes():
+    with Session() as session:
+        deleted = prune_job_changes(session.connection())
+        session.commit()
+    logging.info(f"Pruned {deleted} job changes older than {JOB_CHANGES_RETENTION_DAYS} days.")
+
+def scrape_once(sources, full=False):
+    """Crawl every source once, for one-off runs outside the scheduler.
+    Returns the names of the sources whose crawl failed."""
+    # Stop at the next page and write what was collected, as under the scheduler
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: shutdown.set())
+
+    failed = []
+    try:
+        for source in sources:
+            if shutdown.is_set():
+                break
+            try:
+                scrape_jobs(source, full)
+            except Exception:
+                failed.append(source.name)
+    finally:
+        for source in sources:
+            source.close_engines()
+    return failed
+
+def start_scheduler(sources):
+    import asyncio
+    from scheduler import Scheduler
+
+    scheduler = Scheduler()
+    for source in sources:
+        logging.info(
+            f"Scheduling {source.name} ({source.url}): every {source.interval} minutes, "
+            f"full crawl every {source.full_interval} minutes."
+        )
+        # Both crawls of a source share its lock, so they never overlap
+        scheduler.add(
+            f"{source.name} incremental", lambda source=source: scrape_jobs(source),
+            source.interval * 60, lock_key=source.name
+        )
+        scheduler.add(
+            f"{source.name} full", lambda source=source: scrape_jobs(source, full=True),
+            source.full_interval * 60, lock_key=source.name, run_at_start=True
+        )
+    if JOB_CHANGES_RETENTION_DAYS:
+        scheduler.add("prune job changes", prune_changes, 24 * 3600, run_at_start=True)
+    scheduler.on_stop(shutdown.set)
 
-    while True:
-        try:
-            schedule.run_pending()
-            time.sleep(1)
-        except Exception as e:
-            logging.error(f"Scheduler error: {e}")
-            logging.info("Restarting scheduler in 60 seconds...")
-            time.sleep(60)  # Wait a minute before trying again
+    try:
+        asyncio.run(scheduler.run())
+    finally:
+        for source in sources:
+            source.close_engines()
 
 # ---------- MAIN ----------
 if __name__ == "__main__":
-    create_database()
-    engine = create_tables()
-    Session = sessionmaker(bind=engine)
-    start_scheduler()
+    init_database()
+    start_scraper_exporter()
+    start_scheduler(load_sources())
@@ -0,0 +1,266 @@
+"""Query building for the job listing and facet reads.
+
+Everything here returns SQLAlchemy statements or plain data, so the sync
+Flask API (app.py) and the async read API (async_app.py) filter, order,
+page and serialize listings the same way and only differ in how they run
+the statements.
+"""
+import json
+import base64
+import hashlib
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import and_, or_, tuple_, func, text, select, column, true
+from models import Job, JOB_COLUMNS, job_rows_to_dicts
+from cache import normalize_args
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the standard library encoder
+    orjson = None
+
+MAX_PAGE_SIZE = 100
+FILTER_PARAMS = ('location', 'tag', 'company', 'job_type', 'q', 'posted_after', 'posted_before')
+FACETS = ('company', 'location', 'job_type', 'tag')
+
+# Listings for ?sort=, in descending order with id as a tie-breaker so
+# paging is stable. Each key has a matching (column DESC, id DESC) index.
+SORT_KEYS = {
+    'newest': (Job.created_at, Job.id),  # Most recently added
+    'recent': (Job.posted_on, Job.id),  # Most recently posted
+}
+
+# Maintained by triggers on jobs, see models.JobDatasetVersion
+DATASET_VERSION_QUERY = text("SELECT version, row_count, updated_at FROM job_dataset_version WHERE id = 1")
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Encodes responses with orjson, which is several times faster than json
+    for the listing payloads."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_INDENT_2 if kwargs.get('indent') else 0
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+def use_fast_json(app):
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
+# ---------- FILTERS ----------
+def search_query(q):
+    return func.websearch_to_tsquery('english', q)
+
+# How several values of a repeated filter combine: all (AND) or any (OR)
+LIST_MODES = ('all', 'any')
+
+def list_mode(args, name, default):
+    mode = args.get(name) or default
+    if mode not in LIST_MODES:
+        raise ValueError(f"Unsupported {name} '{mode}', expected one of {list(LIST_MODES)}")
+    return mode
+
+def filter_modes(args):
+    """(location_mode, tag_mode), validated even when there is nothing to combine."""
+    return list_mode(args, 'location_mode', 'any'), list_mode(args, 'tag_mode', 'all')
+
+def match_list(column, values, mode):
+    return column.overlap(values) if mode == 'any' else column.contains(values)
+
+def match_substrings(column, values, mode):
+    matches = [column.ilike(f'%{value}%') for value in values]
+    return or_(*matches) if mode == 'any' else and_(*matches)
+
+def date_param(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be a date in YYYY-MM-DD format")
+
+def apply_filters(query, args):
+    """Add the listing filters in `args` to a Query or select()."""
+    location_mode, tag_mode = filter_modes(args)
+    locations = [value for value in args.getlist('location') if value]
+    tags = [value for value in args.getlist('tag') if value]
+    company = args.get('company')
+    job_type = args.get('job_type')
+    q = args.get('q')
+    posted_after = date_param(args, 'posted_after')
+    posted_before = date_param(args, 'posted_before')
+
+    # Every location is a substring match, like the single-location filter,
+    # so adding a location under `any` can only widen the results
+    if locations:
+        query = query.filter(match_substrings(Job.location, locations, location_mode))
+    if tags:
+        query = query.filter(match_list(Job.tag_list, tags, tag_mode))
+    if company:
+        query = query.filter(Job.company.ilike(f'%{company}%'))
+    if job_type:
+        query = query.filter(Job.job_type.ilike(f'%{job_type}%'))
+    if q:
+        query = query.filter(Job.search_vector.op('@@')(search_query(q)))
+    # Both bounds are inclusive
+    if posted_after:
+        query = query.filter(Job.posted_on >= posted_after)
+    if posted_before:
+        query = query.filter(Job.posted_on <= posted_before)
+    return query
+
+def sort_key(args):
+    sort = args.get('sort', 'newest')
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unsupported sort '{sort}', expected one of {sorted(SORT_KEYS)}")
+    return SORT_KEYS[sort]
+
+def listing_order(key):
+    return tuple(column.desc() for column in key)
+
+def count_statement(query):
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+# ---------- PAGE-NUMBER LISTING ----------
+def page_params(args):
+    return args.get('page', 1, type=int), args.get('per_page', 10, type=int)
+
+def page_listing(args):
+    query = apply_filters(select(*JOB_COLUMNS), args)
+
+    # Free-text searches list the best matches first unless a sort is given
+    order = listing_order(sort_key(args))
+    q = args.get('q')
+    if q and 'sort' not in args:
+        return query.order_by(func.ts_rank(Job.search_vector, search_query(q)).desc(), *order)
+    return query.order_by(*order)
+
+def clamp_page(page, per_page, total):
+    """Move `page` into the valid range. Returns (page, total_pages)."""
+    total_pages = (total + per_page - 1) // per_page if total > 0 else 1
+    return min(max(page, 1), total_pages), total_pages
+
+def page_slice(query, page, per_page):
+    return query.offset((page - 1) * per_page).limit(per_page)
+
+def page_response(rows, total, page, per_page, total_pages):
+    return {
+        'jobs': job_rows_to_dicts(rows),
+        'pagination': {
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'total_pages': total_pages
+        }
+    }
+
+# ---------- CURSOR LISTING ----------
+def is_cursor_request(args):
+    return 'cursor' in args or 'limit' in args
+
+def cursor_params(args):
+    """Returns (limit, cursor, include_total, key), `key` being the SORT_KEYS entry."""
+    limit = min(max(args.get('limit', 10, type=int), 1), MAX_PAGE_SIZE)
+    return limit, args.get('cursor'), args.get('include_total') == '1', sort_key(args)
+
+def cursor_listing(args):
+    return apply_filters(select(*JOB_COLUMNS), args).order_by(*listing_order(sort_key(args)))
+
+def after_cursor(query, cursor, limit, key):
+    if cursor:
+        query = query.filter(tuple_(*key) < tuple_(*decode_cursor(cursor, key)))
+    # Fetch one extra row to find out whether there is a next page
+    return query.limit(limit + 1)
+
+def cursor_response(rows, limit, key, total=None):
+    pagination = {'limit': limit}
+    if total is not None:
+        pagination['total'] = total
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    pagination['next_cursor'] = encode_cursor(rows[-1], key) if has_more else None
+
+    return {
+        'jobs': job_rows_to_dicts(rows),
+        'pagination': pagination
+    }
+
+def sort_name(key):
+    return next(name for name, sort in SORT_KEYS.items() if sort is key)
+
+def encode_cursor(job, key):
+    # The sort is recorded so the cursor can't be replayed under another one
+    sort_column, id_column = key
+    payload = json.dumps([sort_name(key), getattr(job, sort_column.key).isoformat(), getattr(job, id_column.key)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, key):
+    # The sort value is a date or datetime, matching the column's type
+    sort_type = key[0].type.python_type
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort, sort_value, job_id = json.loads(base64.urlsafe_b64decode(padded))
+        after = sort_type.fromisoformat(sort_value), int(job_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if sort != sort_name(key):
+        raise ValueError(f"Cursor was issued for sort '{sort}', not '{sort_name(key)}'")
+    return after
+
+# ---------- CONDITIONAL REQUESTS ----------
+def listing_etag(version, args):
+    return hashlib.blake2b(f"{version}?{normalize_args(args)}".encode(), digest_size=8).hexdigest()
+
+def is_not_modified(request, etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    return request.if_modified_since is not None and request.if_modified_since >= last_modified
+
+# ---------- FACETS ----------
+def facet_limit(args):
+    return min(max(args.get('limit', 10, type=int), 1), MAX_PAGE_SIZE)
+
+def facet_counts(args):
+    """Subquery of (facet, value, count) for the jobs matching `args`.
+
+    Without filters the counts come from the trigger-maintained
+    job_facet_counts table; with filters they are aggregated over the
+    matching jobs only, which the filter indexes keep small.
+    """
+    filter_modes(args)
+    if not any(args.get(name) for name in FILTER_PARAMS):
+        return text("SELECT facet, value, count FROM job_facet_counts WHERE count > 0").columns(
+            column('facet'), column('value'), column('count')
+        ).subquery()
+
+    filtered = apply_filters(select(Job.company, Job.location, Job.job_type, Job.tags), args).subquery()
+    values = func.job_facet_values(
+        filtered.c.company, filtered.c.location, filtered.c.job_type, filtered.c.tags
+    ).table_valued('facet', 'value')
+    return (
+        select(values.c.facet, values.c.value, func.count().label('count'))
+        .select_from(filtered)
+        .join(values, true())
+        .group_by(values.c.facet, values.c.value)
+        .subquery()
+    )
+
+def top_facets(args):
+    facets = facet_counts(args)
+    ranked = select(
+        facets.c.facet, facets.c.value, facets.c.count,
+        func.row_number().over(
+            partition_by=facets.c.facet, order_by=(facets.c.count.desc(), facets.c.value)
+        ).label('rank')
+    ).subquery()
+    return (
+        select(ranked.c.facet, ranked.c.value, ranked.c.count)
+        .where(ranked.c.rank <= facet_limit(args))
+        .order_by(ranked.c.facet, ranked.c.rank)
+    )
+
+def facets_response(rows):
+    result = {facet: [] for facet in FACETS}
+    for facet, value, count in rows:
+        result[facet].append({'value': value, 'count': count})
+    return {'facets': result}
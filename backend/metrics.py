@@ -0,0 +1,145 @@
+import os
+import time
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest,
+    start_http_server, multiprocess
+)
+from sqlalchemy import event
+from database import pool_stats
+
+# Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+# and /metrics aggregates them (see gunicorn.conf.py)
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+SCRAPER_METRICS_PORT = int(os.getenv("SCRAPER_METRICS_PORT", 9101))  # 0 = no exporter
+
+DB_QUERY_BUCKETS = (0, 1, 2, 3, 4, 6, 10, 20, 50)
+
+# ---------- API ----------
+REQUEST_SECONDS = Histogram(
+    'api_request_duration_seconds', 'Time to serve an API request, including streamed bodies',
+    ['method', 'route', 'status']
+)
+REQUEST_DB_QUERIES = Histogram(
+    'api_request_db_queries', 'Database queries run while serving a request', ['route'], buckets=DB_QUERY_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    'api_request_db_seconds', 'Time spent in database queries while serving a request', ['route']
+)
+
+# ---------- DB POOL ----------
+# database.pool_stats of each serving process, summed over live workers under gunicorn
+# (pool_stats key, gauge, scale to the exported unit)
+POOL_GAUGES = (
+    ('size', Gauge('db_pool_size', 'Connections the pool keeps open', multiprocess_mode='livesum'), 1),
+    ('checked_out', Gauge('db_pool_checked_out', 'Connections in use', multiprocess_mode='livesum'), 1),
+    ('checked_in', Gauge('db_pool_checked_in', 'Idle connections in the pool', multiprocess_mode='livesum'), 1),
+    ('overflow', Gauge('db_pool_overflow', 'Connections open beyond the pool size', multiprocess_mode='livesum'), 1),
+    ('checkouts', Gauge('db_pool_checkouts', 'Connection checkouts since the process started', multiprocess_mode='livesum'), 1),
+    ('timeouts', Gauge('db_pool_timeouts', 'Checkouts that gave up after DB_POOL_TIMEOUT', multiprocess_mode='livesum'), 1),
+    ('wait_ms_total', Gauge(
+        'db_pool_wait_seconds', 'Total time spent waiting for a connection since the process started',
+        multiprocess_mode='livesum'
+    ), 0.001),
+    ('wait_ms_max', Gauge(
+        'db_pool_wait_seconds_max', 'Longest wait for a connection since the process started', multiprocess_mode='livemax'
+    ), 0.001),
+)
+
+def observe_pool(engine):
+    stats = pool_stats(engine)
+    for key, gauge, scale in POOL_GAUGES:
+        gauge.set(stats.get(key, 0) * scale)
+
+# ---------- SCRAPER ----------
+PAGE_LOAD_SECONDS = Histogram(
+    'scraper_page_load_seconds', 'Time to load a listing page until its cards are available', ['engine']
+)
+PAGE_PARSE_SECONDS = Histogram(
+    'scraper_page_parse_seconds', 'Time to turn a loaded page into job dicts', ['engine']
+)
+DB_WRITE_SECONDS = Histogram('scraper_db_write_seconds', 'Time to insert and commit one batch of jobs')
+DB_SECONDS_PER_CARD = Histogram(
+    'scraper_db_seconds_per_card', 'Batch write time divided by the cards in the batch',
+    buckets=(.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1)
+)
+CRAWL_SECONDS = Histogram(
+    'scraper_crawl_duration_seconds', 'Duration of a scrape cycle', ['mode'],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800)
+)
+CARDS = Counter('scraper_cards_total', 'Job cards parsed')
+INDEX_HITS = Counter('scraper_index_hits_total', 'Cards rejected by the fingerprint index without a DB hit')
+JOBS_INSERTED = Counter('scraper_jobs_inserted_total', 'Jobs inserted')
+JOBS_SKIPPED = Counter('scraper_jobs_skipped_total', 'Probably-new cards that were already in the database')
+PAGE_RETRIES = Counter('scraper_page_retries_total', 'Page loads retried after a failure', ['engine'])
+ENGINE_RESTARTS = Counter('scraper_engine_restarts_total', 'Browsers or HTTP sessions restarted mid-crawl', ['engine'])
+CRAWL_DEDUP_HIT_RATIO = Gauge('scraper_last_crawl_dedup_hit_ratio', 'Share of cards rejected by the index in the last cycle')
+CRAWL_JOBS_PER_SECOND = Gauge('scraper_last_crawl_jobs_per_second', 'Cards processed per second in the last cycle', ['mode'])
+
+def observe_crawl(mode, stats, seconds):
+    CRAWL_SECONDS.labels(mode).observe(seconds)
+    CRAWL_DEDUP_HIT_RATIO.set(stats.hit_ratio())
+    CRAWL_JOBS_PER_SECOND.labels(mode).set(stats.cards / seconds if seconds else 0)
+
+def start_scraper_exporter():
+    if SCRAPER_METRICS_PORT:
+        start_http_server(SCRAPER_METRICS_PORT)
+
+# ---------- FLASK ----------
+def metrics_registry():
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+def metrics_response(app, engine=None):
+    if engine is not None:
+        observe_pool(engine)
+    return app.response_class(generate_latest(metrics_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+def instrument_app(app, engine):
+    """Record latency per route and the queries each request runs on `engine`."""
+    from flask import g, request, has_request_context
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start = time.perf_counter()
+        g.db_queries = 0
+        g.db_seconds = 0.0
+
+    @app.after_request
+    def record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    # Streamed responses keep the request context until the body is sent,
+    # so observing on teardown covers the whole response
+    @app.teardown_request
+    def observe_request(exc):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        status = g.pop('metrics_status', 500)
+        REQUEST_SECONDS.labels(request.method, route, status).observe(time.perf_counter() - start)
+        REQUEST_DB_QUERIES.labels(route).observe(g.db_queries)
+        REQUEST_DB_SECONDS.labels(route).observe(g.db_seconds)
+        # Every worker refreshes its pool gauges, not only the one serving /metrics
+        observe_pool(engine)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        if has_request_context() and 'db_queries' in g:
+            g.db_queries += 1
+            g.db_seconds += elapsed
+
+    @event.listens_for(engine, 'handle_error')
+    def drop_query_timer(context):
+        starts = context.connection.info.get('query_start') if context.connection is not None else None
+        if starts:
+            starts.pop()
@@ -0,0 +1,39 @@
+"""Add unique constraint on jobs (title, company)
+
+Revision ID: a3f1c2d4b5e6
+Revises: update_job_types
+Create Date: 2025-05-02 10:14:41.512093
+
+"""
+from alembic import op
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c2d4b5e6'
+down_revision = 'update_job_types'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # Remove duplicates, keeping the oldest row for each (title, company)
+    conn.execute(
+        text("""
+        DELETE FROM jobs a
+        USING jobs b
+        WHERE a.title = b.title
+        AND a.company = b.company
+        AND a.id > b.id
+        """)
+    )
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_jobs_title_company', ['title', 'company'])
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_jobs_title_company', type_='unique')
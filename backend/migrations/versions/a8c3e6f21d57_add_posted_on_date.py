@@ -0,0 +1,81 @@
+"""Add posted_on, the parsed date_posted, with a recency index
+
+Revision ID: a8c3e6f21d57
+Revises: f5b8d2a63e91
+Create Date: 2025-06-03 09:12:27.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c3e6f21d57'
+down_revision = 'f5b8d2a63e91'
+branch_labels = None
+depends_on = None
+
+# SQL version of dates.parse_posted_date; relative text is resolved against
+# the day the job was stored. Returns NULL for anything it does not recognise.
+PARSE_POSTED_DATE_SQL = r"""
+CREATE FUNCTION pg_temp.parse_posted_date(value text, base date) RETURNS date AS $$
+DECLARE
+    t text := lower(btrim(coalesce(value, '')));
+    m text[];
+BEGIN
+    IF t IN ('today', 'just now', 'new', 'just posted') THEN
+        RETURN base;
+    ELSIF t = 'yesterday' THEN
+        RETURN base - 1;
+    END IF;
+
+    m := regexp_match(t, '^(\d+)\+?\s*([a-z]+)(\s+ago)?$');
+    IF m IS NOT NULL THEN
+        RETURN base - m[1]::int * CASE
+            WHEN m[2] IN ('s', 'sec', 'secs', 'm', 'min', 'mins', 'minute', 'minutes', 'h', 'hr', 'hrs', 'hour', 'hours') THEN 0
+            WHEN m[2] IN ('d', 'day', 'days') THEN 1
+            WHEN m[2] IN ('w', 'wk', 'wks', 'week', 'weeks') THEN 7
+            WHEN m[2] IN ('mo', 'mos', 'month', 'months') THEN 30
+            WHEN m[2] IN ('y', 'yr', 'yrs', 'year', 'years') THEN 365
+        END;
+    ELSIF t ~ '^\d{4}-\d{2}-\d{2}$' THEN
+        RETURN t::date;
+    ELSIF t ~ '^[a-z]{3} \d{1,2}, \d{4}$' THEN
+        RETURN to_date(t, 'Mon DD, YYYY');
+    ELSIF t ~ '^[a-z]+ \d{1,2}, \d{4}$' THEN
+        RETURN to_date(t, 'FMMonth DD, YYYY');
+    ELSIF t ~ '^\d{1,2} [a-z]{3} \d{4}$' THEN
+        RETURN to_date(t, 'DD Mon YYYY');
+    ELSIF t ~ '^\d{1,2} [a-z]+ \d{4}$' THEN
+        RETURN to_date(t, 'DD FMMonth YYYY');
+    ELSIF t ~ '^\d{1,2}/\d{1,2}/\d{4}$' THEN
+        RETURN to_date(t, 'MM/DD/YYYY');
+    END IF;
+    RETURN NULL;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade():
+    op.add_column('jobs', sa.Column('posted_on', sa.Date(), nullable=True))
+
+    # posted_on is not a facet, so skip the facet trigger for the backfill
+    # instead of having it diff every row of the table
+    op.execute(PARSE_POSTED_DATE_SQL)
+    op.execute("ALTER TABLE jobs DISABLE TRIGGER jobs_facet_counts_update")
+    op.execute("""
+        UPDATE jobs
+        SET posted_on = coalesce(pg_temp.parse_posted_date(date_posted, created_at::date), created_at::date)
+    """)
+    op.execute("ALTER TABLE jobs ENABLE TRIGGER jobs_facet_counts_update")
+
+    op.alter_column('jobs', 'posted_on', nullable=False, server_default=sa.text('CURRENT_DATE'))
+    op.create_index('ix_jobs_posted_on_id', 'jobs', [sa.text('posted_on DESC'), sa.text('id DESC')])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_posted_on_id', table_name='jobs')
+    op.drop_column('jobs', 'posted_on')
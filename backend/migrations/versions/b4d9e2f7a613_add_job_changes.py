@@ -0,0 +1,88 @@
+"""Add job_changes log maintained by triggers
+
+Revision ID: b4d9e2f7a613
+Revises: a8c3e6f21d57
+Create Date: 2025-06-10 14:27:51.603184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d9e2f7a613'
+down_revision = 'a8c3e6f21d57'
+branch_labels = None
+depends_on = None
+
+JOB_CHANGES_DDL = """
+CREATE OR REPLACE FUNCTION log_job_changes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NOT EXISTS (SELECT 1 FROM new_rows) THEN
+            RETURN NULL;
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF NOT EXISTS (SELECT 1 FROM old_rows) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    -- Hold the job_dataset_version row (which every write updates anyway)
+    -- until commit before numbering the changes. Writers then take seq
+    -- values in commit order, so a reader that sees a seq has already
+    -- seen every smaller one.
+    PERFORM 1 FROM job_dataset_version WHERE id = 1 FOR UPDATE;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO job_changes (job_id, op) SELECT id, 'insert' FROM new_rows ORDER BY id;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO job_changes (job_id, op) SELECT id, 'update' FROM new_rows ORDER BY id;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO job_changes (job_id, op) SELECT id, 'delete' FROM old_rows ORDER BY id;
+    ELSE
+        INSERT INTO job_changes (op) VALUES ('reset');
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_changes_insert ON jobs;
+CREATE TRIGGER jobs_changes_insert AFTER INSERT ON jobs
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION log_job_changes();
+DROP TRIGGER IF EXISTS jobs_changes_update ON jobs;
+CREATE TRIGGER jobs_changes_update AFTER UPDATE ON jobs
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION log_job_changes();
+DROP TRIGGER IF EXISTS jobs_changes_delete ON jobs;
+CREATE TRIGGER jobs_changes_delete AFTER DELETE ON jobs
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION log_job_changes();
+DROP TRIGGER IF EXISTS jobs_changes_truncate ON jobs;
+CREATE TRIGGER jobs_changes_truncate AFTER TRUNCATE ON jobs
+FOR EACH STATEMENT EXECUTE FUNCTION log_job_changes();
+"""
+
+
+def upgrade():
+    op.add_column('job_dataset_version', sa.Column(
+        'changes_pruned_through', sa.BigInteger(), nullable=False, server_default='0'
+    ))
+    op.create_table(
+        'job_changes',
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=True),
+        sa.Column('op', sa.String(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), server_default=sa.text("timezone('utc', now())"), nullable=False),
+        sa.PrimaryKeyConstraint('seq')
+    )
+    op.create_index('ix_job_changes_changed_at', 'job_changes', ['changed_at'])
+    # Existing jobs are not logged; clients start from a full listing
+    op.execute(JOB_CHANGES_DDL)
+
+
+def downgrade():
+    for event in ('insert', 'update', 'delete', 'truncate'):
+        op.execute(f"DROP TRIGGER IF EXISTS jobs_changes_{event} ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS log_job_changes()")
+    op.drop_index('ix_job_changes_changed_at', table_name='job_changes')
+    op.drop_table('job_changes')
+    op.drop_column('job_dataset_version', 'changes_pruned_through')
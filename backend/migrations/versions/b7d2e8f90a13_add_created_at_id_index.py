@@ -0,0 +1,42 @@
+"""Add (created_at, id) index for keyset pagination
+
+Revision ID: b7d2e8f90a13
+Revises: a3f1c2d4b5e6
+Create Date: 2025-05-06 09:41:12.208734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e8f90a13'
+down_revision = 'a3f1c2d4b5e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # Rows from before created_at existed predate every timestamped row
+    conn.execute(
+        text("""
+        UPDATE jobs
+        SET created_at = COALESCE((SELECT MIN(created_at) FROM jobs), NOW())
+        WHERE created_at IS NULL
+        """)
+    )
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False, server_default=sa.func.now())
+
+    op.create_index('ix_jobs_created_at_id', 'jobs', [sa.text('created_at DESC'), sa.text('id DESC')])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_created_at_id', table_name='jobs')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True, server_default=None)
@@ -0,0 +1,48 @@
+"""Add trigram and full-text search indexes
+
+Revision ID: c41a9e5f7b20
+Revises: b7d2e8f90a13
+Create Date: 2025-05-09 14:22:57.640118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41a9e5f7b20'
+down_revision = 'b7d2e8f90a13'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'C')"
+)
+
+TRIGRAM_COLUMNS = ('location', 'company', 'job_type')
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'ix_jobs_{column}_trgm', 'jobs', [column],
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+    op.add_column('jobs', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True
+    ))
+    op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_jobs_search_vector', table_name='jobs')
+    op.drop_column('jobs', 'search_vector')
+
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f'ix_jobs_{column}_trgm', table_name='jobs')
@@ -0,0 +1,32 @@
+"""Add crawl_checkpoints for resuming interrupted full crawls
+
+Revision ID: c7e1f4a92b38
+Revises: b4d9e2f7a613
+Create Date: 2025-06-12 09:41:17.284530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e1f4a92b38'
+down_revision = 'b4d9e2f7a613'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'crawl_checkpoints',
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('last_page', sa.Integer(), nullable=False),
+        sa.Column('page_digest', sa.String(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('source')
+    )
+
+
+def downgrade():
+    op.drop_table('crawl_checkpoints')
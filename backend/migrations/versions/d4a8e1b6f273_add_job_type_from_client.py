@@ -0,0 +1,26 @@
+"""Add jobs.job_type_from_client so backfills keep client-set job types
+
+Revision ID: d4a8e1b6f273
+Revises: c7e1f4a92b38
+Create Date: 2025-06-19 14:08:52.617304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8e1b6f273'
+down_revision = 'c7e1f4a92b38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A constant default is stored in the catalog, so existing rows are not rewritten.
+    # Which earlier API jobs had a client-set type is not known; they start unflagged
+    op.add_column('jobs', sa.Column('job_type_from_client', sa.Boolean(), server_default='false', nullable=False))
+
+
+def downgrade():
+    op.drop_column('jobs', 'job_type_from_client')
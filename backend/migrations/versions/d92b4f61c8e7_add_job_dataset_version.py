@@ -0,0 +1,80 @@
+"""Add job_dataset_version counter maintained by triggers
+
+Revision ID: d92b4f61c8e7
+Revises: c41a9e5f7b20
+Create Date: 2025-05-13 11:05:38.917262
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd92b4f61c8e7'
+down_revision = 'c41a9e5f7b20'
+branch_labels = None
+depends_on = None
+
+JOB_DATASET_VERSION_DDL = """
+INSERT INTO job_dataset_version (id, version, row_count, updated_at)
+SELECT 1, 0, COUNT(*), timezone('utc', now()) FROM jobs
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_job_dataset_version() RETURNS trigger AS $$
+DECLARE
+    delta bigint := 0;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) INTO delta FROM new_rows;
+        IF delta = 0 THEN
+            RETURN NULL;
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT -COUNT(*) INTO delta FROM old_rows;
+        IF delta = 0 THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    UPDATE job_dataset_version
+    SET version = version + 1,
+        row_count = CASE WHEN TG_OP = 'TRUNCATE' THEN 0 ELSE row_count + delta END,
+        updated_at = timezone('utc', now())
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_dataset_version_insert ON jobs;
+CREATE TRIGGER jobs_dataset_version_insert AFTER INSERT ON jobs
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_job_dataset_version();
+DROP TRIGGER IF EXISTS jobs_dataset_version_delete ON jobs;
+CREATE TRIGGER jobs_dataset_version_delete AFTER DELETE ON jobs
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_job_dataset_version();
+DROP TRIGGER IF EXISTS jobs_dataset_version_update ON jobs;
+CREATE TRIGGER jobs_dataset_version_update AFTER UPDATE ON jobs
+FOR EACH STATEMENT EXECUTE FUNCTION bump_job_dataset_version();
+DROP TRIGGER IF EXISTS jobs_dataset_version_truncate ON jobs;
+CREATE TRIGGER jobs_dataset_version_truncate AFTER TRUNCATE ON jobs
+FOR EACH STATEMENT EXECUTE FUNCTION bump_job_dataset_version();
+"""
+
+
+def upgrade():
+    op.create_table(
+        'job_dataset_version',
+        sa.Column('id', sa.SmallInteger(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('row_count', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.CheckConstraint('id = 1', name='ck_job_dataset_version_single_row'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(JOB_DATASET_VERSION_DDL)
+
+
+def downgrade():
+    for event in ('insert', 'delete', 'update', 'truncate'):
+        op.execute(f"DROP TRIGGER IF EXISTS jobs_dataset_version_{event} ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS bump_job_dataset_version()")
+    op.drop_table('job_dataset_version')
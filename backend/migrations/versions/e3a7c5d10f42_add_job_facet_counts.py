@@ -0,0 +1,105 @@
+"""Add job_facet_counts summary maintained by triggers
+
+Revision ID: e3a7c5d10f42
+Revises: d92b4f61c8e7
+Create Date: 2025-05-20 16:48:03.551390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7c5d10f42'
+down_revision = 'd92b4f61c8e7'
+branch_labels = None
+depends_on = None
+
+JOB_FACET_COUNTS_DDL = """
+CREATE OR REPLACE FUNCTION job_facet_values(text, text, text, text)
+RETURNS TABLE (facet text, value text) AS $$
+    SELECT 'company', $1 WHERE coalesce($1, '') <> ''
+    UNION ALL
+    SELECT 'job_type', $3 WHERE coalesce($3, '') <> ''
+    UNION ALL
+    SELECT 'location', btrim(v) FROM regexp_split_to_table(coalesce($2, ''), ',') AS v WHERE btrim(v) <> ''
+    UNION ALL
+    SELECT 'tag', btrim(v) FROM regexp_split_to_table(coalesce($4, ''), ',') AS v WHERE btrim(v) <> ''
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Backfill once, when the summary is empty but jobs are not
+INSERT INTO job_facet_counts (facet, value, count)
+SELECT f.facet, f.value, COUNT(*)
+FROM jobs AS j, job_facet_values(j.company, j.location, j.job_type, j.tags) AS f
+WHERE NOT EXISTS (SELECT 1 FROM job_facet_counts)
+GROUP BY f.facet, f.value;
+
+CREATE OR REPLACE FUNCTION update_job_facet_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM job_facet_counts;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO job_facet_counts (facet, value, count)
+        SELECT f.facet, f.value, COUNT(*)
+        FROM new_rows AS j, job_facet_values(j.company, j.location, j.job_type, j.tags) AS f
+        GROUP BY f.facet, f.value
+        ON CONFLICT (facet, value) DO UPDATE SET count = job_facet_counts.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE job_facet_counts AS c
+        SET count = c.count - d.count
+        FROM (
+            SELECT f.facet, f.value, COUNT(*) AS count
+            FROM old_rows AS j, job_facet_values(j.company, j.location, j.job_type, j.tags) AS f
+            GROUP BY f.facet, f.value
+        ) AS d
+        WHERE c.facet = d.facet AND c.value = d.value;
+    ELSE
+        INSERT INTO job_facet_counts (facet, value, count)
+        SELECT f.facet, f.value, SUM(j.sign)
+        FROM (
+            SELECT 1 AS sign, company, location, job_type, tags FROM new_rows
+            UNION ALL
+            SELECT -1, company, location, job_type, tags FROM old_rows
+        ) AS j, job_facet_values(j.company, j.location, j.job_type, j.tags) AS f
+        GROUP BY f.facet, f.value
+        HAVING SUM(j.sign) <> 0
+        ON CONFLICT (facet, value) DO UPDATE SET count = job_facet_counts.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_facet_counts_insert ON jobs;
+CREATE TRIGGER jobs_facet_counts_insert AFTER INSERT ON jobs
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION update_job_facet_counts();
+DROP TRIGGER IF EXISTS jobs_facet_counts_delete ON jobs;
+CREATE TRIGGER jobs_facet_counts_delete AFTER DELETE ON jobs
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION update_job_facet_counts();
+DROP TRIGGER IF EXISTS jobs_facet_counts_update ON jobs;
+CREATE TRIGGER jobs_facet_counts_update AFTER UPDATE ON jobs
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION update_job_facet_counts();
+DROP TRIGGER IF EXISTS jobs_facet_counts_truncate ON jobs;
+CREATE TRIGGER jobs_facet_counts_truncate AFTER TRUNCATE ON jobs
+FOR EACH STATEMENT EXECUTE FUNCTION update_job_facet_counts();
+"""
+
+
+def upgrade():
+    op.create_table(
+        'job_facet_counts',
+        sa.Column('facet', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('facet', 'value')
+    )
+    op.create_index('ix_job_facet_counts_facet_count', 'job_facet_counts', ['facet', sa.text('count DESC')])
+    op.execute(JOB_FACET_COUNTS_DDL)
+
+
+def downgrade():
+    for event in ('insert', 'delete', 'update', 'truncate'):
+        op.execute(f"DROP TRIGGER IF EXISTS jobs_facet_counts_{event} ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS update_job_facet_counts()")
+    op.execute("DROP FUNCTION IF EXISTS job_facet_values(text, text, text, text)")
+    op.drop_index('ix_job_facet_counts_facet_count', table_name='job_facet_counts')
+    op.drop_table('job_facet_counts')
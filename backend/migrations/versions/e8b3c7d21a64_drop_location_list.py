@@ -0,0 +1,34 @@
+"""Drop jobs.location_list, unused since every location filter is a substring match
+
+Revision ID: e8b3c7d21a64
+Revises: d4a8e1b6f273
+Create Date: 2025-06-20 11:23:05.481927
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b3c7d21a64'
+down_revision = 'd4a8e1b6f273'
+branch_labels = None
+depends_on = None
+
+
+def split_list_sql(column):
+    return f"array_remove(string_to_array(btrim(regexp_replace(coalesce({column}, ''), '\\s*,\\s*', ',', 'g')), ','), '')"
+
+
+def upgrade():
+    # Location filters are served by ix_jobs_location_trgm; the array only cost writes
+    op.drop_index('ix_jobs_location_list', table_name='jobs')
+    op.drop_column('jobs', 'location_list')
+
+
+def downgrade():
+    op.add_column('jobs', sa.Column(
+        'location_list', postgresql.ARRAY(sa.Text()), sa.Computed(split_list_sql('location'), persisted=True), nullable=True
+    ))
+    op.create_index('ix_jobs_location_list', 'jobs', ['location_list'], postgresql_using='gin')
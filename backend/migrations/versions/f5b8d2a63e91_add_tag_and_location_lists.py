@@ -0,0 +1,41 @@
+"""Add indexed tag_list and location_list array columns
+
+Revision ID: f5b8d2a63e91
+Revises: e3a7c5d10f42
+Create Date: 2025-05-27 10:31:46.074512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b8d2a63e91'
+down_revision = 'e3a7c5d10f42'
+branch_labels = None
+depends_on = None
+
+
+def split_list_sql(column):
+    return f"array_remove(string_to_array(btrim(regexp_replace(coalesce({column}, ''), '\\s*,\\s*', ',', 'g')), ','), '')"
+
+
+def upgrade():
+    # Stored generated columns are computed for every existing row when added,
+    # and kept in step with tags/location on every later insert or update
+    op.add_column('jobs', sa.Column(
+        'tag_list', postgresql.ARRAY(sa.Text()), sa.Computed(split_list_sql('tags'), persisted=True), nullable=True
+    ))
+    op.add_column('jobs', sa.Column(
+        'location_list', postgresql.ARRAY(sa.Text()), sa.Computed(split_list_sql('location'), persisted=True), nullable=True
+    ))
+    op.create_index('ix_jobs_tag_list', 'jobs', ['tag_list'], postgresql_using='gin')
+    op.create_index('ix_jobs_location_list', 'jobs', ['location_list'], postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_jobs_location_list', table_name='jobs')
+    op.drop_index('ix_jobs_tag_list', table_name='jobs')
+    op.drop_column('jobs', 'location_list')
+    op.drop_column('jobs', 'tag_list')
@@ -1,32 +1,307 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import (
+    Column, Integer, BigInteger, SmallInteger, String, Text, Boolean, Date, DateTime, UniqueConstraint, Index, Computed,
+    CheckConstraint, DDL, desc, event, func
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import declarative_base, deferred
 from datetime import datetime
 
 Base = declarative_base()
 
+# Weighted full-text document for the `q=` search: title > company > tags
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'C')"
+)
+
+# Comma-joined tags exposed as an indexed array of trimmed values
+def split_list_sql(column):
+    return f"array_remove(string_to_array(btrim(regexp_replace(coalesce({column}, ''), '\\s*,\\s*', ',', 'g')), ','), '')"
+
+TAG_LIST_SQL = split_list_sql('tags')
+
+# Columns filtered with ILIKE '%value%', served by pg_trgm GIN indexes
+TRIGRAM_COLUMNS = ('location', 'company', 'job_type')
+
 class Job(Base):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        UniqueConstraint('title', 'company', name='uq_jobs_title_company'),
+        Index('ix_jobs_created_at_id', desc('created_at'), desc('id')),
+        Index('ix_jobs_posted_on_id', desc('posted_on'), desc('id')),
+        Index('ix_jobs_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_jobs_tag_list', 'tag_list', postgresql_using='gin'),
+        *(
+            Index(f'ix_jobs_{column}_trgm', column, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+            for column in TRIGRAM_COLUMNS
+        ),
+    )
     id = Column(Integer, primary_key=True)
     title = Column(String)
     company = Column(String)
     location = Column(String)
     job_type = Column(String)
+    # Set when an API client sent the job_type; the classifier backfill leaves these alone
+    job_type_from_client = Column(Boolean, nullable=False, default=False, server_default='false')
     tags = Column(Text)
-    date_posted = Column(String)
+    date_posted = Column(String)  # Posted-on text as shown on the card, e.g. "3d ago"
+    posted_on = Column(Date, nullable=False, server_default=func.current_date())  # date_posted parsed, see dates.py
     link = Column(String)
     logo = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+    tag_list = deferred(Column(ARRAY(Text), Computed(TAG_LIST_SQL, persisted=True)))
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'company': self.company,
-            'location': self.location,
-            'job_type': self.job_type,
-            'tags': self.tags,
-            'date_posted': self.date_posted or datetime.utcnow().strftime('%Y-%m-%d'),
-            'link': self.link,
-            'logo': self.logo,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        return job_rows_to_dicts([tuple(getattr(self, name) for name in JOB_FIELDS)])[0]
+
+# ---------- SERIALIZATION ----------
+# Fields returned by the API, in response order
+JOB_FIELDS = (
+    'id', 'title', 'company', 'location', 'job_type', 'tags', 'date_posted', 'posted_on', 'link', 'logo', 'created_at'
+)
+
+# Select these instead of Job to get plain row tuples without ORM instances
+JOB_COLUMNS = tuple(getattr(Job, name) for name in JOB_FIELDS)
+
+def job_rows_to_dicts(rows):
+    """Turn rows selected with JOB_COLUMNS into API dicts.
+
+    Jobs without a date_posted text show their posted_on date instead.
+    """
+    jobs = []
+    for row in rows:
+        job = dict(zip(JOB_FIELDS, row))
+        if job['posted_on'] is not None:
+            job['posted_on'] = job['posted_on'].isoformat()
+            job['date_posted'] = job['date_posted'] or job['posted_on']
+        if job['created_at'] is not None:
+            job['created_at'] = job['created_at'].isoformat()
+        jobs.append(job)
+    return jobs
+
+class JobDatasetVersion(Base):
+    """Single-row counter bumped by triggers on every write to jobs.
+
+    `version` changes whenever rows are inserted, updated or deleted, and
+    `row_count` is kept in step, so readers can build ETags and totals
+    without scanning jobs.
+    """
+    __tablename__ = 'job_dataset_version'
+    __table_args__ = (
+        CheckConstraint('id = 1', name='ck_job_dataset_version_single_row'),
+    )
+    id = Column(SmallInteger, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, default=0)
+    row_count = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Highest job_changes.seq deleted by pruning; older change tokens are stale
+    changes_pruned_through = Column(BigInteger, nullable=False, default=0, server_default='0')
+
+class CrawlCheckpoint(Base):
+    """Progress of an unfinished full crawl of a source, so an interrupted
+    crawl resumes where it stopped (see checkpoints.py)."""
+    __tablename__ = 'crawl_checkpoints'
+    source = Column(String, primary_key=True)
+    last_page = Column(Integer, nullable=False)  # This page and every one before it are stored
+    page_digest = Column(String, nullable=False)  # fingerprints.page_digest of last_page
+    started_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+class JobChange(Base):
+    """Append-only log of inserts, updates and deletes on jobs, written by
+    triggers.
+
+    `seq` increases in commit order (see JOB_CHANGES_DDL), so a client can
+    poll for everything after the last seq it has seen. A TRUNCATE is
+    logged as a single 'reset' without a job_id.
+    """
+    __tablename__ = 'job_changes'
+    __table_args__ = (
+        Index('ix_job_changes_changed_at', 'changed_at'),
+    )
+    seq = Column(BigInteger, primary_key=True)
+    job_id = Column(Integer)
+    op = Column(String, nullable=False)  # insert, update, delete or reset
+    changed_at = Column(DateTime, nullable=False, server_default=func.timezone('utc', func.now()))
+
+class JobFacetCount(Base):
+    """Number of jobs per facet value, kept current by triggers on jobs.
+
+    Facets are `company`, `job_type`, and the individual comma-separated
+    entries of `location` and `tags` (facet `tag`).
+    """
+    __tablename__ = 'job_facet_counts'
+    __table_args__ = (
+        Index('ix_job_facet_counts_facet_count', 'facet', desc('count')),
+    )
+    facet = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+# ---------- TRIGGERS ----------
+# Statement-level triggers see every writer (API, scraper, migrations) and
+# use transition tables so a multi-row INSERT bumps the version only once.
+JOB_DATASET_VERSION_DDL = """
+INSERT INTO job_dataset_version (id, version, row_count, updated_at)
+SELECT 1, 0, COUNT(*), timezone('utc', now()) FROM jobs
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_job_dataset_version() RETURNS trigger AS $$
+DECLARE
+    delta bigint := 0;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) INTO delta FROM new_rows;
+        IF delta = 0 THEN
+            RETURN NULL;
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT -COUNT(*) INTO delta FROM old_rows;
+        IF delta = 0 THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    UPDATE job_dataset_version
+    SET version = version + 1,
+        row_count = CASE WHEN TG_OP = 'TRUNCATE' THEN 0 ELSE row_count + delta END,
+        updated_at = timezone('utc', now())
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_dataset_version_insert ON jobs;
+CREATE TRIGGER jobs_dataset_version_insert AFTER INSERT ON jobs
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_job_dataset_version();
+DROP TRIGGER IF EXISTS jobs_dataset_version_delete ON jobs;
+CREATE TRIGGER jobs_dataset_version_delete AFTER DELETE ON jobs
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_job_dataset_version();
+DROP TRIGGER IF EXISTS jobs_dataset_version_update ON jobs;
+CREATE TRIGGER jobs_dataset_version_update AFTER UPDATE ON jobs
+FOR EACH STATEMENT EXECUTE FUNCTION bump_job_dataset_version();
+DROP TRIGGER IF EXISTS jobs_dataset_version_truncate ON jobs;
+CREATE TRIGGER jobs_dataset_version_truncate AFTER TRUNCATE ON jobs
+FOR EACH STATEMENT EXECUTE FUNCTION bump_job_dataset_version();
+"""
+
+JOB_FACET_COUNTS_DDL = """
+CREATE OR REPLACE FUNCTION job_facet_values(text, text, text, text)
+RETURNS TABLE (facet text, value text) AS $$
+    SELECT 'company', $1 WHERE coalesce($1, '') <> ''
+    UNION ALL
+    SELECT 'job_type', $3 WHERE coalesce($3, '') <> ''
+    UNION ALL
+    SELECT 'location', btrim(v) FROM regexp_split_to_table(coalesce($2, ''), ',') AS v WHERE btrim(v) <> ''
+    UNION ALL
+    SELECT 'tag', btrim(v) FROM regexp_split_to_table(coalesce($4, ''), ',') AS v WHERE btrim(v) <> ''
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Backfill once, when the summary is empty but jobs are not
+INSERT INTO job_facet_counts (facet, value, count)
+SELECT f.facet, f.value, COUNT(*)
+FROM jobs AS j, job_facet_values(j.company, j.location, j.job_type, j.tags) AS f
+WHERE NOT EXISTS (SELECT 1 FROM job_facet_counts)
+GROUP BY f.facet, f.value;
+
+CREATE OR REPLACE FUNCTION update_job_facet_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM job_facet_counts;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO job_facet_counts (facet, value, count)
+        SELECT f.facet, f.value, COUNT(*)
+        FROM new_rows AS j, job_facet_values(j.company, j.location, j.job_type, j.tags) AS f
+        GROUP BY f.facet, f.value
+        ON CONFLICT (facet, value) DO UPDATE SET count = job_facet_counts.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE job_facet_counts AS c
+        SET count = c.count - d.count
+        FROM (
+            SELECT f.facet, f.value, COUNT(*) AS count
+            FROM old_rows AS j, job_facet_values(j.company, j.location, j.job_type, j.tags) AS f
+            GROUP BY f.facet, f.value
+        ) AS d
+        WHERE c.facet = d.facet AND c.value = d.value;
+    ELSE
+        INSERT INTO job_facet_counts (facet, value, count)
+        SELECT f.facet, f.value, SUM(j.sign)
+        FROM (
+            SELECT 1 AS sign, company, location, job_type, tags FROM new_rows
+            UNION ALL
+            SELECT -1, company, location, job_type, tags FROM old_rows
+        ) AS j, job_facet_values(j.company, j.location, j.job_type, j.tags) AS f
+        GROUP BY f.facet, f.value
+        HAVING SUM(j.sign) <> 0
+        ON CONFLICT (facet, value) DO UPDATE SET count = job_facet_counts.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_facet_counts_insert ON jobs;
+CREATE TRIGGER jobs_facet_counts_insert AFTER INSERT ON jobs
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION update_job_facet_counts();
+DROP TRIGGER IF EXISTS jobs_facet_counts_delete ON jobs;
+CREATE TRIGGER jobs_facet_counts_delete AFTER DELETE ON jobs
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION update_job_facet_counts();
+DROP TRIGGER IF EXISTS jobs_facet_counts_update ON jobs;
+CREATE TRIGGER jobs_facet_counts_update AFTER UPDATE ON jobs
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION update_job_facet_counts();
+DROP TRIGGER IF EXISTS jobs_facet_counts_truncate ON jobs;
+CREATE TRIGGER jobs_facet_counts_truncate AFTER TRUNCATE ON jobs
+FOR EACH STATEMENT EXECUTE FUNCTION update_job_facet_counts();
+"""
+
+JOB_CHANGES_DDL = """
+CREATE OR REPLACE FUNCTION log_job_changes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NOT EXISTS (SELECT 1 FROM new_rows) THEN
+            RETURN NULL;
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF NOT EXISTS (SELECT 1 FROM old_rows) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    -- Hold the job_dataset_version row (which every write updates anyway)
+    -- until commit before numbering the changes. Writers then take seq
+    -- values in commit order, so a reader that sees a seq has already
+    -- seen every smaller one.
+    PERFORM 1 FROM job_dataset_version WHERE id = 1 FOR UPDATE;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO job_changes (job_id, op) SELECT id, 'insert' FROM new_rows ORDER BY id;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO job_changes (job_id, op) SELECT id, 'update' FROM new_rows ORDER BY id;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO job_changes (job_id, op) SELECT id, 'delete' FROM old_rows ORDER BY id;
+    ELSE
+        INSERT INTO job_changes (op) VALUES ('reset');
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS jobs_changes_insert ON jobs;
+CREATE TRIGGER jobs_changes_insert AFTER INSERT ON jobs
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION log_job_changes();
+DROP TRIGGER IF EXISTS jobs_changes_update ON jobs;
+CREATE TRIGGER jobs_changes_update AFTER UPDATE ON jobs
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION log_job_changes();
+DROP TRIGGER IF EXISTS jobs_changes_delete ON jobs;
+CREATE TRIGGER jobs_changes_delete AFTER DELETE ON jobs
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION log_job_changes();
+DROP TRIGGER IF EXISTS jobs_changes_truncate ON jobs;
+CREATE TRIGGER jobs_changes_truncate AFTER TRUNCATE ON jobs
+FOR EACH STATEMENT EXECUTE FUNCTION log_job_changes();
+"""
+
+# Runs after create_all so the triggers exist even without migrations
+event.listen(Base.metadata, 'after_create', DDL(JOB_DATASET_VERSION_DDL))
+event.listen(Base.metadata, 'after_create', DDL(JOB_FACET_COUNTS_DDL))
+event.listen(Base.metadata, 'after_create', DDL(JOB_CHANGES_DDL))
@@ -0,0 +1,101 @@
+import os
+import time
+import random
+import signal
+import asyncio
+import logging
+
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", 0.1))  # +/- share of every delay, spreads runs apart
+SCHEDULER_MAX_BACKOFF = int(os.getenv("SCHEDULER_MAX_BACKOFF", 3600))  # Seconds, cap on the delay after failures
+SCHEDULER_BUSY_RETRY = int(os.getenv("SCHEDULER_BUSY_RETRY", 30))  # Seconds before retrying a job whose lock is held
+
+def jittered(seconds):
+    return max(seconds * (1 + random.uniform(-SCHEDULER_JITTER, SCHEDULER_JITTER)), 0)
+
+def backoff_delay(interval, failures):
+    """Delay before the next run after `failures` consecutive failures."""
+    return min(interval * 2 ** failures, max(interval, SCHEDULER_MAX_BACKOFF))
+
+class ScheduledJob:
+    def __init__(self, name, func, interval, lock, run_at_start=False):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.lock = lock
+        self.run_at_start = run_at_start
+        self.failures = 0
+
+class Scheduler:
+    """Runs blocking jobs on their own intervals from one asyncio loop.
+
+    Each job runs in a worker thread. Jobs registered with the same lock
+    key never overlap: when a job comes due while its lock is held it is
+    retried after SCHEDULER_BUSY_RETRY seconds instead of queueing behind
+    the running one. Intervals are measured from the start of a run, so a
+    run that overshoots its interval is followed by the next one straight
+    away rather than by a backlog. A failing job is retried with
+    exponential backoff until it succeeds again. SIGINT and SIGTERM stop
+    new runs and wait for running ones to return.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.locks = {}
+        self.stop_callbacks = []
+        self.stopping = None
+
+    def add(self, name, func, interval, lock_key=None, run_at_start=False):
+        lock = self.locks.setdefault(lock_key or name, asyncio.Lock())
+        self.jobs.append(ScheduledJob(name, func, interval, lock, run_at_start))
+
+    def on_stop(self, callback):
+        """Call `callback` when a stop is requested, e.g. to interrupt running jobs."""
+        self.stop_callbacks.append(callback)
+
+    def stop(self):
+        if self.stopping.is_set():
+            return
+        logging.info("Stopping scheduler, waiting for running jobs to finish...")
+        self.stopping.set()
+        for callback in self.stop_callbacks:
+            callback()
+
+    async def run(self):
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+
+        await asyncio.gather(*(self.run_job(job) for job in self.jobs))
+        logging.info("Scheduler stopped.")
+
+    async def sleep(self, seconds):
+        """Sleep unless a stop is requested first. Returns False once stopping."""
+        if self.stopping.is_set():
+            return False
+        try:
+            await asyncio.wait_for(self.stopping.wait(), seconds)
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    async def run_job(self, job):
+        delay = 0 if job.run_at_start else jittered(job.interval)
+        while await self.sleep(delay):
+            if job.lock.locked():
+                delay = jittered(SCHEDULER_BUSY_RETRY)
+                logging.info(f"{job.name}: another run holds the lock, retrying in {round(delay)} seconds.")
+                continue
+
+            async with job.lock:
+                start = time.monotonic()
+                try:
+                    await asyncio.to_thread(job.func)
+                    job.failures = 0
+                    delay = jittered(max(job.interval - (time.monotonic() - start), 0))
+                except Exception as e:
+                    job.failures += 1
+                    delay = jittered(backoff_delay(job.interval, job.failures))
+                    logging.error(
+                        f"{job.name} failed ({job.failures} in a row): {e}. Next run in {round(delay)} seconds."
+                    )
@@ -1,9 +1,12 @@
-from app import app, db, Job
+from app import create_app, db
+from models import Job
 from sqlalchemy import func
 
+app = create_app(migrations=False)
+
 with app.app_context():
-    print('Total jobs:', Job.query.count())
-    print('Jobs with location containing "New York":', Job.query.filter(Job.location.ilike('%New York%')).count())
+    print('Total jobs:', db.session.query(Job).count())
+    print('Jobs with location containing "New York":', db.session.query(Job).filter(Job.location.ilike('%New York%')).count())
 
     # Check company values
     print('\nUnique company values (first 10):')
@@ -18,11 +21,11 @@ with app.app_context():
         print(f"- {job_type[0]}")
 
     # Check if there are any non-empty job_type values
-    print('\nJobs with non-empty job_type:', Job.query.filter(Job.job_type != None, Job.job_type != '').count())
+    print('\nJobs with non-empty job_type:', db.session.query(Job).filter(Job.job_type != None, Job.job_type != '').count())
 
     # Print a few examples of jobs with non-empty job_type
     print('\nExample jobs with non-empty job_type:')
-    for job in Job.query.filter(Job.job_type != None, Job.job_type != '').limit(3):
+    for job in db.session.query(Job).filter(Job.job_type != None, Job.job_type != '').limit(3):
         print(f"- {job.title} at {job.company} with job_type: '{job.job_type}'")
 
     # Check job type statistics
@@ -35,6 +38,7 @@ with app.app_context():
     job_types = ['Full-time', 'Part-time', 'Contract', 'Remote', 'Internship']
     for job_type in job_types:
         print(f"\nExample {job_type} jobs:")
-        jobs = Job.query.filter(Job.job_type == job_type).limit(2).all()
+        jobs = db.session.query(Job).filter(Job.job_type == job_type).limit(2).all()
         for job in jobs:
-            print(f"- {job.title} at {job.company} in {job.location}")
\ No newline at end of file
+            print(f"- {job.title} at {job.company} in {job.location}")
+
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules are flat, top-level imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import make_engine
+
+@pytest.fixture(scope='module')
+def engine():
+    """The Postgres database in DATABASE_URL; skips the test when it is not
+    configured or not reachable."""
+    if not os.getenv('DATABASE_URL') and not os.getenv('POSTGRES_HOST'):
+        pytest.skip('No database configured')
+    engine = make_engine()
+    try:
+        with engine.connect():
+            pass
+    except Exception as e:
+        pytest.skip(f'Postgres is not available: {e}')
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db_client(engine, monkeypatch):
+    """Flask test client whose database writes are rolled back afterwards,
+    including the trigger-maintained counters and change feed."""
+    from sqlalchemy.orm import scoped_session, sessionmaker
+    from app import create_app, db
+
+    app = create_app(migrations=False)
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        # Commits in the app only release a savepoint of this transaction
+        monkeypatch.setattr(db, 'session', scoped_session(sessionmaker(bind=conn, join_transaction_mode='create_savepoint')))
+        try:
+            yield app.test_client()
+        finally:
+            transaction.rollback()
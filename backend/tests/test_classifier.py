@@ -0,0 +1,79 @@
+"""classify_job_type rules, client-set job types, and the SQL CASE the
+backfill uses. The database checks need Postgres, are skipped without it
+and roll back what they write."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select
+
+from classifier import classify_job_type, job_type_sql, reclassify_id_range
+from ingest import validate_job_row
+from models import Job
+
+TITLES = [
+    ('Remote Pricing Actuary', 'London', 'Remote'),
+    ('Pricing Actuary', 'Remote - US', 'Remote'),
+    ('Part-time Actuarial Analyst', '', 'Part-time'),
+    ('Part Time Reserving Analyst', '', 'Part-time'),
+    ('Contract Actuary', '', 'Contract'),
+    ('Actuarial Contractor', '', 'Contract'),
+    ('Temp Pricing Analyst', '', 'Contract'),
+    ('Temporary Valuation Analyst', '', 'Contract'),
+    ('Actuarial Intern', '', 'Internship'),
+    ('Summer Internship - Actuarial', '', 'Internship'),
+    ('International Pricing Actuary', '', 'Full-time'),
+    ('Internal Audit Actuary', '', 'Full-time'),
+    ('Template Designer', '', 'Full-time'),
+    ('Contemporary Art Risk Actuary', '', 'Full-time'),
+    ('Contractual Risk Actuary', '', 'Full-time'),
+]
+
+@pytest.mark.parametrize('title, location, expected', TITLES, ids=[title for title, _, _ in TITLES])
+def test_classify_job_type(title, location, expected):
+    assert classify_job_type(title, location) == expected
+
+def test_client_job_type_is_kept():
+    row = validate_job_row({'title': 'Internal Audit Intern', 'company': 'Aon', 'job_type': 'Full-time'}, datetime.utcnow())
+    assert row['job_type'] == 'Full-time'
+    assert row['job_type_from_client'] is True
+
+def test_missing_job_type_is_classified():
+    now = datetime.utcnow()
+    row = validate_job_row({'title': 'Actuarial Intern', 'company': 'Aon'}, now)
+    assert row['job_type'] == 'Internship'
+    assert row['job_type_from_client'] is False
+    assert validate_job_row({'title': 'Template Designer', 'company': 'Aon', 'job_type': ''}, now)['job_type'] == 'Full-time'
+
+def test_client_job_type_is_kept_by_the_api(db_client):
+    response = db_client.post('/api/jobs', json={'title': 'Actuarial Intern', 'company': 'Test Co', 'job_type': 'Contract'})
+    assert response.status_code == 201
+    assert response.get_json()['job']['job_type'] == 'Contract'
+
+def test_sql_rules_match_python(engine):
+    """job_type_sql() over scratch rows, rolled back afterwards, gives the same types as classify_job_type."""
+    with engine.connect() as conn, conn.begin() as transaction:
+        ids = conn.execute(
+            insert(Job).returning(Job.id, sort_by_parameter_order=True),
+            [{'title': title, 'company': 'Classifier Test Co', 'location': location, 'job_type': 'Seasonal'}
+             for title, location, _ in TITLES]
+        ).scalars().all()
+        sql_types = dict(conn.execute(select(Job.id, job_type_sql()).where(Job.id.in_(ids))).all())
+        transaction.rollback()
+
+    python_types = [classify_job_type(title, location) for title, location, _ in TITLES]
+    assert [sql_types[job_id] for job_id in ids] == python_types
+
+def test_backfill_keeps_client_job_types(engine):
+    with engine.connect() as conn, conn.begin() as transaction:
+        ids = conn.execute(
+            insert(Job).returning(Job.id, sort_by_parameter_order=True),
+            [
+                {'title': 'Actuarial Intern', 'company': 'Backfill Test Co', 'job_type': 'Contract', 'job_type_from_client': True},
+                {'title': 'Actuarial Intern II', 'company': 'Backfill Test Co', 'job_type': 'Contract', 'job_type_from_client': False},
+            ]
+        ).scalars().all()
+        reclassify_id_range(conn, min(ids) - 1, max(ids))
+        job_types = conn.execute(select(Job.job_type).where(Job.id.in_(ids)).order_by(Job.id)).scalars().all()
+        transaction.rollback()
+
+    assert job_types == ['Contract', 'Internship']
@@ -0,0 +1,22 @@
+"""POST /api/jobs validates and defaults a job like POST /api/jobs/bulk.
+Needs Postgres; what the requests write is rolled back."""
+from datetime import datetime
+
+import pytest
+
+@pytest.mark.parametrize('body, error', [
+    ({'title': 'Pricing Actuary'}, "'company' is required"),
+    ({'title': 'Pricing Actuary', 'company': 'Test Co', 'tags': ['Life']}, "'tags' must be a string"),
+    ({'title': 123, 'company': 'Test Co'}, "'title' is required"),
+    (['not', 'an', 'object'], 'Expected a JSON object'),
+])
+def test_invalid_job_is_rejected(db_client, body, error):
+    response = db_client.post('/api/jobs', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+
+def test_empty_date_posted_defaults_to_today(db_client):
+    response = db_client.post('/api/jobs', json={'title': 'Pricing Actuary', 'company': 'Test Co', 'date_posted': ''})
+    assert response.status_code == 201
+    job = response.get_json()['job']
+    assert job['date_posted'] == job['posted_on'] == datetime.utcnow().date().isoformat()
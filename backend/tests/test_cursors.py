@@ -0,0 +1,24 @@
+from collections import namedtuple
+from datetime import date, datetime
+
+import pytest
+
+from listing import SORT_KEYS, decode_cursor, encode_cursor
+
+Row = namedtuple('Row', 'id created_at posted_on')
+ROW = Row(7, datetime(2025, 6, 1, 12, 30), date(2025, 5, 30))
+
+@pytest.mark.parametrize('sort', sorted(SORT_KEYS))
+def test_cursor_round_trip(sort):
+    key = SORT_KEYS[sort]
+    assert decode_cursor(encode_cursor(ROW, key), key) == (getattr(ROW, key[0].key), 7)
+
+def test_cursor_from_another_sort_is_rejected():
+    cursor = encode_cursor(ROW, SORT_KEYS['recent'])
+    with pytest.raises(ValueError, match="sort 'recent'"):
+        decode_cursor(cursor, SORT_KEYS['newest'])
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'WyIyMDI1LTA2LTAxIiwgN10'])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(cursor, SORT_KEYS['newest'])
@@ -0,0 +1,41 @@
+"""The Selenium extraction modes return the same jobs as parse_listing_html
+for the saved listing page. Needs headless Chrome; skipped without it."""
+import os
+from urllib.parse import urlparse
+
+import pytest
+
+from job_scraper import SeleniumEngine, parse_listing_html
+
+FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'actuarylist_page.html'))
+
+@pytest.fixture(scope='module')
+def browser():
+    engine = SeleniumEngine()
+    try:
+        engine.open()
+    except Exception as e:
+        pytest.skip(f'Chrome is not available: {e}')
+    engine.driver.get(f'file://{FIXTURE}')
+    yield engine
+    engine.close()
+
+def comparable(jobs):
+    # Under file:// the browser resolves relative links against the file, so only paths compare
+    return [
+        {**{k: v for k, v in job.items() if k != 'created_at'}, 'link': urlparse(job['link']).path}
+        for job in jobs
+    ]
+
+@pytest.fixture(scope='module')
+def expected():
+    with open(FIXTURE, encoding='utf-8') as f:
+        jobs, _ = parse_listing_html(f.read())
+    return comparable(jobs)
+
+@pytest.mark.parametrize('mode', ['script', 'elements'])
+def test_selenium_modes_match_html_parser(browser, expected, mode):
+    extract = browser.extract_cards_script if mode == 'script' else browser.extract_cards_elements
+    jobs = comparable(extract())
+    assert jobs == expected
+    assert any(job['logo'] is None for job in jobs)
@@ -0,0 +1,44 @@
+"""Every listing filter must be served by an index rather than a sequential scan.
+
+Needs the Postgres database in DATABASE_URL; skipped when it is not
+configured or not reachable.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from werkzeug.datastructures import MultiDict
+
+from listing import apply_filters
+from models import Job
+
+# (filter args, index the filter needs)
+FILTERS = [
+    ({'location': 'New York'}, 'ix_jobs_location_trgm'),
+    ({'company': 'Aon'}, 'ix_jobs_company_trgm'),
+    ({'job_type': 'Remote'}, 'ix_jobs_job_type_trgm'),
+    ({'q': 'pricing actuary'}, 'ix_jobs_search_vector'),
+    ({'tag': ['Life', 'Pricing']}, 'ix_jobs_tag_list'),
+    ({'location': ['London', 'New York']}, 'ix_jobs_location_trgm'),
+]
+
+@pytest.fixture
+def conn(engine):
+    # SET LOCAL only lasts until the rollback, so the setting never leaks
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            conn.execute(text('SET LOCAL enable_seqscan = off'))  # small tables are always cheaper to scan
+            yield conn
+        finally:
+            transaction.rollback()
+
+@pytest.mark.parametrize('args, index', FILTERS, ids=[str(args) for args, _ in FILTERS])
+def test_filter_uses_index(conn, args, index):
+    exists = conn.execute(text('SELECT 1 FROM pg_indexes WHERE indexname = :index'), {'index': index}).scalar()
+    if not exists:
+        pytest.skip(f'{index} is missing; run the migrations (the trigram indexes need pg_trgm)')
+
+    with Session(bind=conn) as session:
+        compiled = apply_filters(session.query(Job), MultiDict(args)).statement.compile(dialect=conn.dialect)
+    plan = conn.exec_driver_sql(f'EXPLAIN {compiled}', compiled.params).scalars().all()
+    assert any(index in line for line in plan), f"Filter {args} does not use {index}:\n" + '\n'.join(plan)
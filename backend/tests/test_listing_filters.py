@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from werkzeug.datastructures import MultiDict
+
+from listing import apply_filters, facet_counts
+from models import Job
+
+def where_sql(args):
+    statement = apply_filters(select(Job.id), MultiDict(args))
+    return str(statement.compile(dialect=postgresql.dialect())).split('WHERE', 1)[1]
+
+def test_single_location_is_a_substring_match():
+    assert where_sql({'location': 'York'}).count('jobs.location ILIKE') == 1
+
+def test_several_locations_keep_substring_semantics():
+    sql = where_sql({'location': ['York', 'London']})
+    assert sql.count('jobs.location ILIKE') == 2
+    assert ' OR ' in sql
+
+def test_location_mode_all_requires_every_location():
+    sql = where_sql({'location': ['York', 'London'], 'location_mode': 'all'})
+    assert sql.count('jobs.location ILIKE') == 2
+    assert ' AND ' in sql
+
+def test_tags_match_list_entries():
+    assert 'tag_list @>' in where_sql({'tag': ['Life', 'Pricing']})
+    assert 'tag_list &&' in where_sql({'tag': ['Life', 'Pricing'], 'tag_mode': 'any'})
+
+@pytest.mark.parametrize('args', [
+    {'location': ['York', 'London'], 'location_mode': 'either'},
+    {'location': 'York', 'location_mode': 'ALL'},
+    {'tag': 'Life', 'tag_mode': 'some'},
+    {'tag_mode': 'none'},
+])
+def test_invalid_modes_are_rejected(args):
+    with pytest.raises(ValueError, match='_mode'):
+        apply_filters(select(Job.id), MultiDict(args))
+
+def test_invalid_mode_is_rejected_without_other_filters_in_facets():
+    with pytest.raises(ValueError, match='tag_mode'):
+        facet_counts(MultiDict({'tag_mode': 'none'}))
@@ -0,0 +1,57 @@
+"""HttpEngine pages that are empty without marking the end of the listing
+are retried instead of ending the crawl."""
+import os
+
+import pytest
+
+import job_scraper
+from job_scraper import HttpEngine, fetch_page_with_retry
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'actuarylist_page.html')
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.urls = []
+
+    def get(self, url, timeout):
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+def http_engine(*responses):
+    engine = HttpEngine('https://www.actuarylist.com/')
+    engine.session = FakeSession(*responses)
+    return engine
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(job_scraper, 'SCRAPE_RETRY_BACKOFF', 0)
+
+def test_blocked_page_is_retried():
+    with open(FIXTURE, encoding='utf-8') as f:
+        listing = f.read()
+    engine = http_engine(FakeResponse(200, '<html><body>Access denied</body></html>'), FakeResponse(200, listing))
+
+    jobs, last_page = fetch_page_with_retry(engine, 2)
+    assert len(jobs) == 25
+    assert last_page is False
+    assert len(engine.session.urls) == 2
+
+def test_empty_page_fails_once_retries_run_out(monkeypatch):
+    monkeypatch.setattr(job_scraper, 'SCRAPE_PAGE_RETRIES', 1)
+    engine = http_engine(FakeResponse(200, ''), FakeResponse(200, '<html><body></body></html>'))
+
+    with pytest.raises(Exception):
+        fetch_page_with_retry(engine, 3)
+
+def test_not_found_past_first_page_is_last_page():
+    assert fetch_page_with_retry(http_engine(FakeResponse(404, '')), 5) == ([], True)
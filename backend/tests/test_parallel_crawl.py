@@ -0,0 +1,57 @@
+"""The parallel crawl stops its fetch workers when writing pages fails."""
+import time
+import threading
+
+import pytest
+
+import job_scraper
+from checkpoints import CrawlProgress
+from job_scraper import CrawlStats, KnownPageTracker, ScrapeEngine, scrape_jobs_parallel
+
+class FakeEngine(ScrapeEngine):
+    """A listing of `page_count` one-card pages that counts its page loads."""
+
+    name = 'fake'
+    fetched = []
+    lock = threading.Lock()
+
+    def __init__(self, page_count):
+        super().__init__('https://example.com/')
+        self.page_count = page_count
+
+    def fetch_page(self, page_number):
+        time.sleep(0.002)
+        with self.lock:
+            self.fetched.append(page_number)
+        if page_number > self.page_count:
+            return [], True
+        return [{'title': f'Job {page_number}', 'company': 'Test Co', 'link': f'/jobs/{page_number}'}], page_number >= self.page_count
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    monkeypatch.setattr(job_scraper, 'SCRAPE_RPS', 0)
+    monkeypatch.setattr(job_scraper, 'SCRAPE_BATCH_SIZE', 0)
+    monkeypatch.setattr(job_scraper, 'filter_new_jobs', lambda jobs, stats: jobs)
+    FakeEngine.fetched = []
+
+def test_failed_write_stops_the_workers(monkeypatch):
+    def write_pages(session, jobs, stats, progress):
+        raise RuntimeError('db down')
+
+    monkeypatch.setattr(job_scraper, 'write_pages', write_pages)
+    engines = [FakeEngine(500) for _ in range(3)]
+
+    with pytest.raises(RuntimeError, match='db down'):
+        scrape_jobs_parallel(None, engines, KnownPageTracker(0), CrawlStats(), CrawlProgress('test'))
+
+    # Workers are joined before the error is raised, so nothing fetches afterwards
+    fetched = len(FakeEngine.fetched)
+    time.sleep(0.05)
+    assert len(FakeEngine.fetched) == fetched < 500
+
+def test_crawl_reads_every_page_until_the_last(monkeypatch):
+    written = []
+    monkeypatch.setattr(job_scraper, 'write_pages', lambda session, jobs, stats, progress: written.extend(jobs))
+
+    assert scrape_jobs_parallel(None, [FakeEngine(20) for _ in range(3)], KnownPageTracker(0), CrawlStats(), CrawlProgress('test'))
+    assert sorted(job['title'] for job in written) == sorted(f'Job {page}' for page in range(1, 21))
@@ -0,0 +1,71 @@
+import os
+from datetime import timedelta
+
+import pytest
+
+from job_scraper import parse_listing_html
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'actuarylist_page.html')
+
+@pytest.fixture(scope='module')
+def html():
+    with open(FIXTURE) as f:
+        return f.read()
+
+@pytest.fixture(scope='module')
+def jobs(html):
+    jobs, _ = parse_listing_html(html)
+    return jobs
+
+def test_parses_every_card(jobs):
+    assert len(jobs) == 25
+    assert len({job['link'] for job in jobs}) == 25
+
+def test_card_fields(jobs):
+    job = jobs[1]
+    assert job['title'] == 'Pricing Actuary'
+    assert job['company'] == 'Swiss Re'
+    assert job['location'] == 'London, Hartford, New York'
+    assert job['tags'] == 'Life, Health'
+    assert job['date_posted'] == '2d ago'
+    assert job['posted_on'] == job['created_at'].date() - timedelta(days=2)
+    assert job['link'] == 'https://www.actuarylist.com/actuarial-jobs/1001-pricing-actuary-swiss-re'
+    assert job['logo'] == 'https://www.actuarylist.com/logos/swiss-re.png'
+
+def test_card_without_logo_is_kept(jobs):
+    job = next(job for job in jobs if job['company'] == "Lloyd's Syndicate")
+    assert job['logo'] is None
+
+def test_relative_links_are_made_absolute(jobs):
+    assert all(job['link'].startswith('https://www.actuarylist.com/') for job in jobs)
+
+def test_job_type_from_title(jobs):
+    assert jobs[-1]['title'] == 'Valuation Actuary (Remote)'
+    assert jobs[-1]['job_type'] == 'Remote'
+    assert jobs[0]['job_type'] == 'Full-time'
+
+def test_enabled_next_button_is_not_last_page(html):
+    _, last_page = parse_listing_html(html)
+    assert last_page is False
+
+def test_disabled_next_button_is_last_page(html):
+    _, last_page = parse_listing_html(html.replace('<button>Next</button>', '<button disabled>Next</button>'))
+    assert last_page is True
+
+def test_missing_next_button_is_last_page(html):
+    _, last_page = parse_listing_html(html.replace('<button>Next</button>', ''))
+    assert last_page is True
+
+EMPTY_PAGE = '<html><body><p>{}</p>{}</body></html>'
+
+def test_empty_results_marker_is_last_page():
+    assert parse_listing_html(EMPTY_PAGE.format('No jobs found', '')) == ([], True)
+
+def test_empty_page_with_disabled_next_is_last_page():
+    assert parse_listing_html(EMPTY_PAGE.format('', '<button disabled>Next</button>')) == ([], True)
+
+@pytest.mark.parametrize('next_button', ['', '<button>Next</button>'])
+def test_empty_page_without_end_marker_raises(next_button):
+    # A block page or a listing that did not render must be retried, not end the crawl
+    with pytest.raises(ValueError):
+        parse_listing_html(EMPTY_PAGE.format('Access denied', next_button))
@@ -0,0 +1,24 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from database import InstrumentedQueuePool
+from metrics import observe_pool
+
+def sample(name):
+    return REGISTRY.get_sample_value(name)
+
+def test_pool_gauges_follow_pool_stats():
+    engine = create_engine('sqlite://', poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=0)
+    with engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+        observe_pool(engine)
+        assert sample('db_pool_size') == 2
+        assert sample('db_pool_checked_out') == 1
+        assert sample('db_pool_checkouts') == 1
+
+    observe_pool(engine)
+    assert sample('db_pool_checked_out') == 0
+    assert sample('db_pool_checked_in') == 1
+    assert sample('db_pool_timeouts') == 0
+    assert sample('db_pool_wait_seconds') >= sample('db_pool_wait_seconds_max') > 0
+    engine.dispose()